@@ -1,37 +1,172 @@
 """
-Turnierverwaltung – Flask + PyYAML in einer einzigen Datei
-Speichert alle Daten in data.yaml (legt sie bei Bedarf an).
-Start:  python app.py   (oder via Docker)
+Turnierverwaltung – Flask + PyYAML
+Speichert alle Daten in data.yaml (legt sie bei Bedarf an),
+alternativ in SQLite (STORAGE_BACKEND=sqlite).
+Start:  python app.py   (Entwicklung)
+        gunicorn -c gunicorn.conf.py app:app   (Produktion, oder via Docker)
+Umzug:  flask import-yaml / flask export-yaml
+Mehrere Vereine: tenants.yaml anlegen, siehe tenants.py
 
 © 2025 – feel free to adapt!
 """
-import os, uuid, yaml, datetime as dt
-import calendar
+import os, uuid, hashlib, json, time, logging, threading, datetime as dt
+import calendar, heapq, cProfile, pstats
+from bisect import bisect_left
+from functools import wraps
+import click
 from pathlib import Path
 from flask import (
     Flask, request, redirect, url_for,
-    flash, render_template_string, make_response,
-    session, abort
+    flash, render_template, make_response,
+    session, abort, jsonify, Response, stream_with_context, stream_template, g,
+    has_request_context
 )
+from jinja2 import ChoiceLoader, DictLoader
+from werkzeug.http import is_resource_modified
+from werkzeug.local import LocalProxy
+from markupsafe import Markup
+from store import DataStore
+from backends import YamlBackend, SqliteBackend, open_backend
+from cache import LRUCache
+from indexes import IntervalIndex, NameIndex, AttendanceIndex
+from views import ViewCache, build_view
+from tiering import ColdArchive, move_cold, start_tiering
+from tenants import ENVIRON_KEY, Tenant, TenantConfig, TenantMiddleware, Tenants, load_config
+import metrics
+from metrics import REQUESTS, REQUEST_SECONDS, RENDER_SECONDS, PROFILES_SKIPPED
+from templates import TEMPLATES
+from assets import Assets, compress, compress_stream
+import feeds
 
-DATA_FILE = Path("data.yaml")
+DATA_FILE = Path(os.environ.get("DATA_FILE", "data.yaml"))
+SQLITE_FILE = Path(os.environ.get("SQLITE_FILE", "data.sqlite3"))
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "yaml")  # yaml | sqlite
 DATE_FMT  = "%Y-%m-%d"
 PAST_KEEP_DAYS = 60  # zwei Monate
+JOURNAL_COMPACT_BYTES = int(os.environ.get("JOURNAL_COMPACT_BYTES", 256 * 1024))
+GROUP_COMMIT_WINDOW_MS = float(os.environ.get("GROUP_COMMIT_WINDOW_MS", 5))
+GROUP_COMMIT_MAX_OPS = int(os.environ.get("GROUP_COMMIT_MAX_OPS", 64))
+FRAGMENT_CACHE_SIZE = int(os.environ.get("FRAGMENT_CACHE_SIZE", 512))
+ARCHIVE_PAGE_SIZE = int(os.environ.get("ARCHIVE_PAGE_SIZE", 20))
+ARCHIVE_PAGE_MAX  = 100
+FEED_CACHE_SIZE = int(os.environ.get("FEED_CACHE_SIZE", 256))
+NAME_SUGGESTIONS_MAX = 50
+ADMIN_PAGE_SIZE = 25
+STATUSES = ("attending", "interested", "no")
+COLD_ARCHIVE_DIR = Path(os.environ.get("COLD_ARCHIVE_DIR", "archive"))
+COLD_AFTER_DAYS = max(int(os.environ.get("COLD_AFTER_DAYS", 365)), PAST_KEEP_DAYS)
+COLD_TIER_INTERVAL_HOURS = float(os.environ.get("COLD_TIER_INTERVAL_HOURS", 0))  # 0 = off
+EVENTS_STREAM_SECONDS = float(os.environ.get("EVENTS_STREAM_SECONDS", 300))  # then the browser reconnects
+EVENTS_KEEPALIVE_SECONDS = 15
+# Open live-update streams per worker process. Each one holds a gthread worker
+# thread, so by default they may take half of WEB_THREADS; with an async
+# worker class (WEB_WORKER_CLASS=gevent) raise it. Pages that find no free
+# stream poll every EVENTS_POLL_SECONDS instead.
+EVENTS_MAX_STREAMS = int(os.environ.get("EVENTS_MAX_STREAMS",
+                                        max(int(os.environ.get("WEB_THREADS", 4)) // 2, 1)))
+EVENTS_POLL_SECONDS = float(os.environ.get("EVENTS_POLL_SECONDS", 10))
+# Profiling: every request slower than PROFILE_SLOW_MS (0 = off) leaves a
+# cProfile report in PROFILE_DIR; admins can force one with "X-Profile: 1".
+# One request per process at a time, see _start_timer()
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", 0))
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "profiles"))
+# Multi-tenant mode if this file exists; loaded tenants share the budget
+TENANTS_FILE = Path(os.environ.get("TENANTS_FILE", "tenants.yaml"))
+TENANT_MEMORY_MB = float(os.environ.get("TENANT_MEMORY_MB", 256))
 
-app = Flask(__name__)
-app.secret_key = "change-me-in-production"
-ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "adminpass")
+app = Flask(__name__, static_folder=None)  # served by asset() below
+app.secret_key = os.environ.get("SECRET_KEY", "change-me-in-production")
+ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "adminpass")  # without tenants.yaml
 
-# ---------- YAML Persistence ----------
-def _load():
-    if not DATA_FILE.exists():
-        return {"tournaments": []}
-    with DATA_FILE.open("r", encoding="utf8") as f:
-        return yaml.safe_load(f) or {"tournaments": []}
+# ---------- Data Store ----------
+# Parsed once and kept resident; only changes made by other workers are
+# replayed. Persistence is pluggable, see backends.py. Form submissions go
+# through submit(), which coalesces concurrent writes into one (group commit).
+def _open_store(backend):
+    store = DataStore(backend, GROUP_COMMIT_WINDOW_MS / 1000, GROUP_COMMIT_MAX_OPS)
+    store.add_index("names", NameIndex())
+    store.add_index("attendance", AttendanceIndex())
+    return store
 
-def _save(data):
-    with DATA_FILE.open("w", encoding="utf8") as f:
-        yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+# ---------- Templates ----------
+# Compiled once at startup; Jinja keeps the compiled templates in its cache.
+app.jinja_env.loader = ChoiceLoader([DictLoader(TEMPLATES), app.jinja_env.loader])
+for _name in TEMPLATES:
+    app.jinja_env.get_template(_name)
+
+# ---------- Static Assets ----------
+# Fingerprinted and precompressed at startup, see assets.py
+ASSETS = Assets(Path(__file__).with_name("static"))
+app.jinja_env.globals["asset_url"] = lambda name: url_for("asset", name=ASSETS.fingerprinted(name))
+# Part of every page ETag: a deploy with new templates or assets must not
+# revalidate pages that link asset names the new process no longer serves
+BUILD = hashlib.sha256(repr((sorted(TEMPLATES.items()), ASSETS.version)).encode()).hexdigest()[:12]
+
+# Readiness flags, see /healthz/ready
+READY = {"templates": True, "data": False}
+
+# ---------- Tenants ----------
+# Every tenant has its own store and caches (tenants.py). Without a
+# tenants.yaml there is a single one, "default", using the files above.
+def _open_tenant(config):
+    config.data_file.parent.mkdir(parents=True, exist_ok=True)
+    return Tenant(
+        config,
+        store=_open_store(open_backend(STORAGE_BACKEND, config.data_file, config.sqlite_file,
+                                       JOURNAL_COMPACT_BYTES)),
+        # View models of the hot tournaments and their rendered cards, both
+        # keyed by tournament id + per-tournament version
+        views=ViewCache(),
+        fragments=LRUCache(FRAGMENT_CACHE_SIZE),
+        # iCalendar feeds by ETag (which covers the data version)
+        feeds=LRUCache(FEED_CACHE_SIZE),
+        # Tournaments older than COLD_AFTER_DAYS live in per-year files, read-only
+        cold=ColdArchive(config.cold_dir),
+    )
+
+if TENANTS_FILE.exists():
+    _configs, _default = load_config(TENANTS_FILE)
+    TENANTS = Tenants(_configs, _open_tenant, TENANT_MEMORY_MB * 2**20, _default)
+    app.wsgi_app = TenantMiddleware(app.wsgi_app, TENANTS)
+else:
+    TENANTS = Tenants([TenantConfig("default", DATA_FILE, SQLITE_FILE, COLD_ARCHIVE_DIR, ADMIN_PASSWORD)],
+                      _open_tenant, TENANT_MEMORY_MB * 2**20, "default")
+
+def _tenant():
+    """Tenant of the current request; outside requests (CLI, warm-up) the
+    default tenant."""
+    if not has_request_context():
+        if TENANTS.default is None:
+            raise RuntimeError("no default tenant configured")
+        return TENANTS.get(TENANTS.default)
+    tenant = g.get("tenant")
+    if tenant is None:
+        name = request.environ.get(ENVIRON_KEY, TENANTS.default)
+        if name is None:
+            abort(404)
+        tenant = g.tenant = TENANTS.get(name)
+    return tenant
+
+# The rest of the module uses these as if there were only one tenant
+STORE = LocalProxy(lambda: _tenant().store)
+VIEWS = LocalProxy(lambda: _tenant().views)
+FRAGMENTS = LocalProxy(lambda: _tenant().fragments)
+FEEDS = LocalProxy(lambda: _tenant().feeds)
+COLD = LocalProxy(lambda: _tenant().cold)
+
+def _is_admin():
+    # The session cookie is shared by all path-prefixed tenants
+    return session.get("admin") == _tenant().name
+
+# ---------- Cold Archive ----------
+def _cold_cutoff():
+    return (_today() - dt.timedelta(days=COLD_AFTER_DAYS)).isoformat()
+
+if COLD_TIER_INTERVAL_HOURS > 0:
+    # Idle tenants are tiered once they are loaded again
+    # One worker process does it, see tiering.py
+    start_tiering(lambda: [(t.store, t.cold) for t in TENANTS.loaded()], _cold_cutoff,
+                  COLD_TIER_INTERVAL_HOURS * 3600, DATA_FILE.with_name("tiering.lock"))
 
 # ---------- Helper ----------
 def _today():
@@ -42,65 +177,152 @@ def _parse(dstr):
         return dstr
     return dt.datetime.strptime(dstr, DATE_FMT).date()
 
-def _filter_lists():
-    data = _load()
+def _view(stored, cold=False):
+    """Immutable view model of a stored tournament (views.py); hot ones are
+    built once per tournament version."""
+    if cold:
+        return build_view(stored, f"cold:{COLD.stamp()}", cold=True)
+    return VIEWS.get(STORE, stored["id"])
+
+def _intervals():
+    return STORE.derived("intervals", lambda tournaments: IntervalIndex(
+        (_parse(t["start_date"]), _parse(t["end_date"]), t["id"]) for t in tournaments))
+
+def _by_start():
+    # [(start_iso, tid, end_iso)] of all tournaments, ascending
+    return STORE.derived("by_start", lambda tournaments: sorted(
+        (_parse(t["start_date"]).isoformat(), t["id"], _parse(t["end_date"]).isoformat())
+        for t in tournaments))
+
+def _border():
+    return _today() - dt.timedelta(days=PAST_KEEP_DAYS)
+
+def _upcoming():
+    # The archive is paged separately, see _archive_page(). The split depends
+    # on today's date, so it is kept per data version and day.
+    per_day = STORE.derived("upcoming", lambda tournaments: {})
     today = _today()
-    border = today - dt.timedelta(days=PAST_KEEP_DAYS)
-    upcoming, archive = [], []
-    for t in data["tournaments"]:
-        s_date = _parse(t["start_date"])
-        e_date = _parse(t["end_date"])
-        # Build dates list
-        t["dates"] = []
-        for i in range((e_date - s_date).days + 1):
-            d = s_date + dt.timedelta(days=i)
-            t["dates"].append({
-                "iso": d.isoformat(),
-                "fmt": d.strftime("%d.%m.%y")
-            })
-        # Format start/end
-        t["start_fmt"] = s_date.strftime("%d.%m.%y")
-        t["end_fmt"]   = e_date.strftime("%d.%m.%y")
-        # Sort into upcoming/archive
-        if e_date >= border:
-            upcoming.append(t)
+    upcoming = per_day.get(today)
+    if upcoming is None:
+        stored, _ = STORE.split(_border().isoformat())
+        VIEWS.prune(STORE.by_id.keys())
+        views = (VIEWS.get(STORE, t["id"]) for t in stored)
+        upcoming = tuple(sorted((v for v in views if v is not None), key=lambda v: v.start))
+        per_day.clear()
+        per_day[today] = upcoming
+    return upcoming
+
+def _hot_archive(cursor, ids):
+    border = _border().isoformat()
+    keys = _by_start()
+    i = bisect_left(keys, cursor or (border,))
+    while i > 0:
+        i -= 1
+        start, tid, end = keys[i]
+        if end < border and (ids is None or tid in ids):
+            yield (start, tid), STORE.by_id[tid], False
+
+def _cold_archive(cursor, filter_name):
+    # Every year starts with a placeholder keyed above all of its dates
+    # (("2025",) > ("2024-12-31", ...)). heapq.merge only asks for the year's
+    # tournaments once it has passed the placeholder, so a year file is not
+    # loaded before the page actually reaches that year.
+    for year in COLD.years():
+        if cursor and year > int(cursor[0][:4]):
+            continue
+        yield (str(year + 1),), None, True
+        tournaments, index = COLD.load(year)
+        ids = index.search(filter_name) if filter_name else None
+        for t in tournaments:
+            key = (str(t["start_date"]), t["id"])
+            if (cursor and key >= cursor) or (ids is not None and t["id"] not in ids):
+                continue
+            if t["id"] not in STORE.by_id:  # still hot after an interrupted move
+                yield key, t, True
+
+def _archive_page(cursor="", size=ARCHIVE_PAGE_SIZE, filter_name=""):
+    """One archive page, newest first: tournaments strictly older than `cursor`
+    ("<start_date>_<id>" of the last one shown), from the hot store and the
+    cold archive. Returns (page, next_cursor)."""
+    cursor = tuple(cursor.split("_", 1)) if cursor else None
+    ids = STORE.search(filter_name) if filter_name else None
+    stream = heapq.merge(_hot_archive(cursor, ids), _cold_archive(cursor, filter_name),
+                         key=lambda entry: entry[0], reverse=True)
+    page, last = [], None
+    for key, t, cold in stream:
+        if len(page) == size:
+            return page, "_".join(last)
+        if t is None:  # a cold year's placeholder
+            continue
+        page.append(_view(t, cold))
+        last = key
+    return page, ""
+
+def _valid_cursor(cursor):
+    # "<start_date>_<id>" as produced by _archive_page(), with an ISO date
+    start, sep, tid = cursor.partition("_")
+    try:
+        return bool(sep and tid) and _parse(start).isoformat() == start
+    except ValueError:
+        return False
+
+def _conditional(view):
+    """Answer If-None-Match with 304 before any data is touched or rendered.
+
+    The ETag covers the build (templates and asset names), the data version,
+    the filter cookie and today's date (the upcoming/archive border moves
+    daily)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        raw = "|".join((BUILD, request.full_path, STORE.version(), str(COLD.stamp()),
+                        request.cookies.get("filter", ""), _today().isoformat()))
+        etag = hashlib.sha1(raw.encode("utf8")).hexdigest()
+        # Weak match: compressed responses carry the ETag as weak, see _compress()
+        if request.if_none_match.contains_weak(etag):
+            resp = make_response("", 304)
         else:
-            archive.append(t)
-        # Sort participants
-        t["participants"].sort(key=lambda p: p["name"].lower())
-    # Sort tournaments
-    upcoming.sort(key=lambda t: _parse(t["start_date"]))
-    archive.sort(key=lambda t: _parse(t["start_date"]), reverse=True)
-    return upcoming, archive
+            resp = make_response(view(*args, **kwargs))
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.vary.add("Cookie")
+        return resp
+    return wrapper
 
 # ---------- Routes ----------
 @app.route("/", methods=["GET"])
+@_conditional
 def index():
-    tournaments, _ = _filter_lists()
+    tournaments = _upcoming()
     filter_name = request.cookies.get("filter", "")
     if filter_name:
-        key = filter_name.lower()
-        tournaments = [
-            t for t in tournaments
-            if (key in t["name"].lower())
-            or (t.get("location","") and key in t["location"].lower())
-            or any(key in p["name"].lower() for p in t["participants"])
-        ]
+        ids = STORE.search(filter_name)
+        tournaments = [t for t in tournaments if t.id in ids]
     return _render_page(tournaments, archive=False, filter_name=filter_name)
 
 @app.route("/archive", methods=["GET"])
+@_conditional
 def archive():
-    _, tournaments = _filter_lists()
+    cursor = request.args.get("cursor", "")
+    if cursor and not _valid_cursor(cursor):
+        abort(400)
+    size = max(1, min(request.args.get("size", ARCHIVE_PAGE_SIZE, type=int), ARCHIVE_PAGE_MAX))
     filter_name = request.cookies.get("filter", "")
-    if filter_name:
-        key = filter_name.lower()
-        tournaments = [
-            t for t in tournaments
-            if (key in t["name"].lower())
-            or (t.get("location","") and key in t["location"].lower())
-            or any(key in p["name"].lower() for p in t["participants"])
-        ]
-    return _render_page(tournaments, archive=True, filter_name=filter_name)
+    tournaments, next_cursor = _archive_page(cursor, size, filter_name)
+    # Year headings: a page continuing the year of the previous page has none
+    year = cursor[:4]
+    entries = []
+    for t in tournaments:
+        t_year = t.start_date[:4]
+        entries.append((t_year if t_year != year else None, t))
+        year = t_year
+    page_args = {"archive": True, "entries": entries}
+    if next_cursor:
+        page_args["next_url"] = url_for("archive", cursor=next_cursor, size=size)
+        page_args["next_partial_url"] = url_for("archive", cursor=next_cursor, size=size, partial=1)
+    if request.args.get("partial"):
+        page_args["entries"] = [(y, _render_card(t)) for y, t in entries]
+        return render_template("archive_page.html", **page_args)
+    return _render_page(tournaments, filter_name=filter_name, **page_args)
 
 @app.route("/create", methods=["POST"])
 def create():
@@ -124,8 +346,7 @@ def create():
         flash("Ungültiges Datum. Enddatum muss ≥ Startdatum sein.")
         return redirect(url_for("index"))
 
-    data = _load()
-    data["tournaments"].append({
+    STORE.submit({"op": "create", "tournament": {
         "id": uuid.uuid4().hex,
         "name": name,
         "start_date": start_date,
@@ -134,15 +355,18 @@ def create():
         "link": link,
         "description": description,
         "participants": []
-    })
-    _save(data)
+    }})
     flash("Turnier angelegt!")
     return redirect(url_for("index"))
 
 @app.route("/signup/<tid>", methods=["POST"])
 def signup(tid):
+    if STORE.get(tid) is None:  # e.g. a stale page of a deleted tournament
+        return _unknown_tournament()
     pname = request.form.get("player", "").strip()
     if not pname:
+        if _wants_json():
+            return jsonify(error="Bitte einen Namen eingeben."), 400
         flash("Bitte einen Namen eingeben.")
         return redirect(url_for("index"))
 
@@ -151,71 +375,53 @@ def signup(tid):
         for key,val in request.form.items()
         if key.startswith("status_")
     }
-    data = _load()
-    for t in data["tournaments"]:
-        if t["id"] == tid:
-            for p in t["participants"]:
-                if p["name"].lower() == pname.lower():
-                    p["statuses"] = status_map
-                    break
-            else:
-                t["participants"].append({
-                    "id": uuid.uuid4().hex,
-                    "name": pname,
-                    "statuses": status_map
-                })
-            break
-    _save(data)
+    STORE.submit({"op": "signup", "tid": tid, "pid": uuid.uuid4().hex,
+                 "name": pname, "statuses": status_map})
+    if _wants_json():
+        t, p = STORE.get(tid), STORE.participant(tid, pname)
+        if t is None or p is None:
+            abort(404)
+        return jsonify(tid=tid, pid=p["id"], html=_render_row(t, p), headcounts=_headcounts(tid))
     flash("Teilnahmestatus gespeichert!")
     # Redirect back to referrer (archive or index) and scroll to the tournament card
     ref = request.headers.get("Referer", "")
     base = ref.split('#')[0] if ref else url_for("index")
     return redirect(f"{base}#tournament-{tid}")
 
+def _unknown_tournament():
+    if _wants_json():
+        return jsonify(error="Turnier nicht gefunden."), 404
+    flash("Turnier nicht gefunden.")
+    return redirect(url_for("index"))
+
 # ---------- Admin ----------
 @app.route("/admin", methods=["GET","POST"])
 def admin():
     if request.method=="POST":
-        if request.form.get("password","") == ADMIN_PASSWORD:
-            session["admin"] = True
+        if request.form.get("password","") == _tenant().config.admin_password:
+            session["admin"] = _tenant().name
             return redirect(url_for("admin"))
         flash("Falsches Passwort.")
-    if not session.get("admin"):
-        return render_template_string("""
-        <form method="post">
-          <label>Admin-Passwort</label>
-          <input name="password" type="password">
-          <button type="submit">Login</button>
-        </form>
-        """)
-    data = _load()
-    return render_template_string("""
-    <!doctype html><html lang="de"><head><meta charset="utf-8">
-    <title>Admin-Panel</title><style>
-      :root{--accent:#c00000;}
-      body{font-family:system-ui,sans-serif;padding:1rem;}
-      .btn-primary{background:var(--accent);color:#fff;padding:.5rem 1rem;border:none;border-radius:.5rem;}
-    </style></head><body>
-    <h1>Admin-Panel</h1>
-    <p><a href="{{ url_for('index') }}">Zurück</a> | 
-       <a href="{{ url_for('admin_logout') }}">Logout</a></p>
-    {% for t in data["tournaments"] %}
-      <fieldset style="margin:1rem 0;padding:1rem;border:1px solid #ddd;">
-        <legend>{{ t.name }}</legend>
-        <form method="post" action="{{ url_for('delete_tournament', tid=t.id) }}">
-          <button class="btn-primary">Turnier löschen</button>
-        </form>
-        <h4>Teilnehmer</h4>
-        {% for p in t.participants %}
-          <form method="post" action="{{ url_for('delete_participant', tid=t.id, pid=p.id) }}" style="display:inline-block;margin:.25rem;">
-            {{ p.name }}
-            <button class="btn-primary">Löschen</button>
-          </form>
-        {% endfor %}
-      </fieldset>
-    {% endfor %}
-    </body></html>
-    """, data=data)
+    if not _is_admin():
+        return render_template("login.html")
+    q = request.args.get("q", "").strip()
+    first = request.args.get("from", "").strip()
+    last = request.args.get("until", "").strip()
+    tids = _admin_matches(q, first, last)
+    pages = max(1, -(-len(tids) // ADMIN_PAGE_SIZE))
+    page = min(max(request.args.get("page", 1, type=int), 1), pages)
+    shown = tids[(page - 1) * ADMIN_PAGE_SIZE:page * ADMIN_PAGE_SIZE]
+    return render_template("admin.html",
+                           tournaments=[v for v in (VIEWS.get(STORE, tid) for tid in shown) if v is not None],
+                           total=len(tids), page=page, pages=pages, q=q, first=first, last=last,
+                           dates={k: v for k, v in (("from", first), ("until", last)) if v})
+
+def _admin_matches(q, first, last):
+    """Ids of hot tournaments matching the search and overlapping [first, last]
+    (ISO dates, both optional), newest first."""
+    ids = STORE.search(q) if q else None
+    return [tid for start, tid, end in reversed(_by_start())
+            if (ids is None or tid in ids) and (not first or end >= first) and (not last or start <= last)]
 
 @app.route("/admin/logout")
 def admin_logout():
@@ -224,37 +430,67 @@ def admin_logout():
 
 @app.route("/admin/delete_tournament/<tid>", methods=["POST"])
 def delete_tournament(tid):
-    if not session.get("admin"): abort(403)
-    data = _load()
-    data["tournaments"] = [t for t in data["tournaments"] if t["id"]!=tid]
-    _save(data)
+    if not _is_admin(): abort(403)
+    STORE.apply({"op": "delete_tournament", "tid": tid})
     flash("Turnier gelöscht.")
     return redirect(url_for("admin"))
 
 
 @app.route("/admin/delete_participant/<tid>/<pid>", methods=["POST"])
 def delete_participant(tid, pid):
-    if not session.get("admin"): abort(403)
-    data = _load()
-    for t in data["tournaments"]:
-        if t["id"] == tid:
-            t["participants"] = [p for p in t["participants"] if p["id"]!=pid]
-    _save(data)
+    if not _is_admin(): abort(403)
+    STORE.apply({"op": "delete_participant", "tid": tid, "pid": pid})
     flash("Teilnehmer gelöscht.")
     return redirect(url_for("admin"))
 
+@app.route("/admin/bulk_delete", methods=["POST"])
+def admin_bulk_delete():
+    """Delete all selected tournaments and participants in one write."""
+    if not _is_admin(): abort(403)
+    tids = set(request.form.getlist("tournament"))
+    ops = [{"op": "delete_tournament", "tid": tid} for tid in tids]
+    for value in request.form.getlist("participant"):
+        tid, _, pid = value.partition(":")
+        if tid not in tids:  # gone with its tournament anyway
+            ops.append({"op": "delete_participant", "tid": tid, "pid": pid})
+    if ops:
+        STORE.apply(*ops)
+    flash(f"{len(tids)} Turnier(e) und {len(ops) - len(tids)} Teilnehmer gelöscht.")
+    target = request.form.get("next", "")
+    return redirect(target if target.startswith(url_for("admin")) else url_for("admin"))
+
+@app.route("/admin/purge", methods=["POST"])
+def admin_purge():
+    """Delete every tournament that ended before the given date, hot and cold."""
+    if not _is_admin(): abort(403)
+    try:
+        before = _parse(request.form.get("before", "").strip()).isoformat()
+    except ValueError:
+        flash("Ungültiges Datum.")
+        return redirect(url_for("admin"))
+    cold = []
+    def build(tournaments):
+        # Under the store's write lock, like move_cold(): the year files too
+        cold.append(COLD.purge(before))
+        return [{"op": "delete_tournament", "tid": t["id"]}
+                for t in tournaments if str(t["end_date"]) < before]
+    ops = STORE.apply_with(build)
+    flash(f"{len(ops) + cold[0]} Turnier(e) mit Ende vor {before} gelöscht.")
+    return redirect(url_for("admin"))
+
 # ---------- Tournament Edit ----------
 @app.route("/edit_tournament/<tid>", methods=["POST"])
 def edit_tournament(tid):
+    if STORE.get(tid) is None:
+        return _unknown_tournament()
     link = request.form.get("link", "").strip()
     description = request.form.get("description", "").strip()
-    data = _load()
-    for t in data["tournaments"]:
-        if t["id"] == tid:
-            t["link"] = link
-            t["description"] = description
-            break
-    _save(data)
+    STORE.submit({"op": "edit", "tid": tid, "link": link, "description": description})
+    if _wants_json():
+        t = STORE.get(tid)
+        if t is None:
+            abort(404)
+        return jsonify(tid=tid, html=_render_card(_view(t)))
     flash("Turnier aktualisiert!")
     ref = request.headers.get("Referer", "")
     base = ref.split('#')[0] if ref else url_for("index")
@@ -264,337 +500,557 @@ def edit_tournament(tid):
 def set_filter():
     resp = make_response(redirect(request.headers.get("Referer", url_for("index"))))
     # If clear button was clicked
+    # Scoped to the tenant's path prefix, if any
+    path = request.script_root or "/"
     if request.form.get("clear"):
-        resp.delete_cookie("filter")
+        resp.delete_cookie("filter", path=path)
         return resp
     # Otherwise set or delete based on filter input
     filter_name = request.form.get("filter", "").strip()
     if filter_name:
-        resp.set_cookie("filter", filter_name, max_age=365*24*3600)
+        resp.set_cookie("filter", filter_name, max_age=365*24*3600, path=path)
     else:
-        resp.delete_cookie("filter")
+        resp.delete_cookie("filter", path=path)
     return resp
 
-# ---------- Template ----------
-def _render_page(tournaments, archive=False, filter_name=""):
-    base_tpl = """
-    <!doctype html><html lang="de"><head>
-    <meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-    <title>Turnierverwaltung</title>
-    
-    <style>
-    :root{--accent:#c00000;}
-    body{font-family:system-ui,sans-serif;margin:0;padding:1rem;background:#fafafa;}
-    header, .card{background:#fff;border-radius:.75rem;}
-    header{display:flex;align-items:center;padding:1rem;margin-bottom:1rem;box-shadow:0 2px 4px rgba(0,0,0,.1);}
-    .logo{max-width:90px;height:auto;}
-    .headline{color:var(--accent);font-size:1.75rem;font-weight:600;margin-left:1rem;}
-    .tabs{display:flex;gap:1rem;margin:1rem 0;}
-    .tabs a{padding:.5rem 1rem;text-decoration:none;border-radius:.5rem;color:#333;background:#f0f0f0;}
-    .tabs a.active, .tabs a:hover{background:var(--accent);color:#fff;}
-    .btn-primary{background:var(--accent);color:#fff;padding:.5rem 1rem;border:none;border-radius:.5rem;}
-    .form-label{margin-top:1rem;display:block;font-weight:500;}
-    input, select, textarea{width:100%;padding:.5rem;border:1px solid #ddd;border-radius:.5rem;margin-top:.25rem;}
-    .grid{display:flex;flex-direction:column;gap:1.5rem;}
-    .status-table{width:100%;border-collapse:collapse;margin:1rem 0;overflow-x:auto;}
-    .status-table th, .status-table td{border:1px solid #ddd;padding:.75rem;text-align:center;white-space:nowrap;}
-    .status-attending{background:#d4edda;} .status-interested{background:#fff3cd;} .status-no{background:#f8d7da;}
-    .status-field{display:flex;align-items:center;gap:.5rem;margin-bottom:.75rem;}
-    .status-field label{width:5rem;}
-    .card form .form-group input,
-    .card form .status-field select{width:auto;max-width:200px;}
-        /* Card layout */
-        .card { padding: 1.5rem; margin-bottom: 1.5rem; border: 1px solid #e0e0e0; box-shadow:0 2px 4px rgba(0,0,0,.05);}
-        .card-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem; }
-        .card-header h2 { margin: 0; font-size: 1.5rem; }
-        .card-header small { color: #666; }
-        .card-body { display: grid; grid-template-columns: 2fr 1fr; gap: 1rem; }
-        .card-left { overflow-x: auto; }
-        .card-right { background: #f9f9f9; padding: 1rem; border-radius: 0.5rem; }
-        .status-table th { background: var(--accent); color: #fff; }
-        /* Always show details if present */
-        .detail-container { margin-bottom: 1rem; }
-        /* Create form toggle */
-        .create-container { display: none; margin-top: 0.5rem; }
-        .create-container.active { display: block; }
-    /* ---------- Mobile Tweaks ---------- */
-    /* Header scales on narrow screens */
-    header { flex-wrap: wrap; }
-    .logo   { max-width: 14vw; height: auto; }
-    .headline {
-      font-size: clamp(1.25rem, 4vw, 1.75rem);
-      margin-top: .5rem;
-    }
+# ---------- Live Updates ----------
+# Server-Sent Events from the store's change feed. Event ids are sequence
+# numbers, which all workers share, so a reconnect may land on any worker.
+# Streams are capped per process (EVENTS_MAX_STREAMS); a page turned away
+# polls /events/poll with the last sequence number it has seen instead.
+_STREAM_SLOTS = threading.BoundedSemaphore(EVENTS_MAX_STREAMS)
 
-    /* Stack table + form vertically on small screens */
-    @media (max-width: 600px) {
-      .card-body  { display: flex; flex-direction: column; }
-      .card-right { margin-top: 1rem; }
-      .card-left table { width: 100%; }
-    }
-    /* Calendar responsive: mobile swipe, desktop fixed 4 months */
-    .cal-wrapper {
-      display: flex;
-      gap: 1rem;
-      -webkit-overflow-scrolling: touch;
-      scroll-snap-type: x mandatory;
-      padding-bottom: .5rem;
-    }
-    @media (max-width: 900px) {
-      .cal-wrapper { overflow-x: auto; }
-      .cal { flex: 0 0 260px; scroll-snap-align: start; }
-    }
-    @media (min-width: 901px) {
-      .cal-wrapper { overflow: hidden; }
-      .cal { flex: 0 0 25%; /* four per row */ }
-    }
-    /* Calendar cell styling remains unchanged */
-    .cal { border:1px solid #ddd; border-radius:.5rem; overflow:hidden; }
-    .cal-header { background:var(--accent); color:#fff; text-align:center; padding:.25rem 0; font-weight:600; }
-    .cal-grid { display:grid; grid-template-columns:repeat(7,1fr); }
-    .cal-cell { padding:.25rem; text-align:center; border-bottom:1px solid #eee; border-right:1px solid #eee; }
-    .cal-cell:last-child { border-right:none; }
-    .cal-day { font-size:.85rem; color:#666; }
-    .cal-cell.active { background:#d4edda; cursor:pointer; }
-    .cal-cell.active:hover { background:#bfe0c2; }
-    /* Standard links in accent red, no underline */
-    a, a:hover {
-      color: var(--accent);
-      text-decoration: none;
-    }
-        /* Tournament edit form toggle */
-        .edit-tour-container { display: none; margin-top: 1rem; }
-        .edit-tour-container.active { display: block; }
-    </style>
-    </head><body>
-    <header>
-      <img src="https://beta.aixtraball.de/static/images/logo.png" class="logo" alt="Logo">
-      <h1 class="headline">Turnierverwaltung</h1>
-    </header>
-    <nav class="tabs">
-      <a href="{{ url_for('index') }}" class="{% if not archive %}active{% endif %}">Übersicht</a>
-      <a href="{{ url_for('archive') }}" class="{% if archive %}active{% endif %}">Archiv</a>
-    </nav>
-    <form method="post" action="{{ url_for('set_filter') }}" style="margin-bottom:1rem;">
-  <input type="text" name="filter" placeholder="Nach Teilnehmer, Event oder Location filtern"
-         value="{{ filter_name }}"
-         style="padding:.5rem;border:1px solid #ddd;border-radius:.5rem;width:200px;">
-  <button class="btn-primary" type="submit">Anwenden</button>
-  {% if filter_name %}
-    <button class="btn-primary" type="submit" name="clear" value="1">Löschen</button>
-  {% endif %}
-</form>
-    <div class="cal-wrapper">
-      {% for m in calendar_months %}
-      <div class="cal">
-        <div class="cal-header">{{ m.name }}</div>
-        <div class="cal-grid">
-          {% for day in ['Mo','Tu','We','Th','Fr','Sa','Su'] %}
-            <div class="cal-cell cal-day">{{ day }}</div>
-          {% endfor %}
-          {% for wk in m.weeks %}
-            {% for c in wk %}
-              {% if c.day %}
-                {% if c.active %}
-                  <a href="#tournament-{{ c.tid }}" class="cal-cell active">{{ c.day }}</a>
-                {% else %}
-                  <div class="cal-cell">{{ c.day }}</div>
-                {% endif %}
-              {% else %}
-                <div class="cal-cell">&nbsp;</div>
-              {% endif %}
-            {% endfor %}
-          {% endfor %}
-        </div>
-      </div>
-      {% endfor %}
-    </div>
-    <datalist id="player_names">
-      {% for name in all_names %}<option value="{{ name }}">{% endfor %}
-    </datalist>
-
-    {% if not archive %}
-    <div class="card">
-      <button type="button" class="btn-primary create-toggle">Neues Turnier anlegen</button>
-      <div class="create-container">
-        <h2>Neues Turnier anlegen</h2>
-        <form method="post" action="{{ url_for('create') }}">
-          <label class="form-label">Name</label>
-          <input name="name" placeholder="Turniername" required>
-          <label class="form-label">Startdatum</label>
-          <input type="date" name="start_date" required>
-          <label class="form-label">Enddatum <small>(optional)</small></label>
-          <input type="date" name="end_date">
-          <label class="form-label">Ort <small>(optional)</small></label>
-          <input name="location" placeholder="Ort">
-          <label class="form-label">Link <small>(optional)</small></label>
-          <input name="link" placeholder="https://example.com">
-          <label class="form-label">Beschreibung <small>(optional)</small></label>
-          <textarea name="description" rows="3"></textarea>
-          <button class="btn-primary" type="submit">Speichern</button>
-        </form>
-      </div>
-    </div>
-    {% endif %}
-
-    <div class="grid">
-    {% for t in tournaments %}
-      <div class="card" id="tournament-{{ t.id }}">
-        <div class="card-header">
-          <div>
-            <h2>{{ t.name }}</h2>
-            <small>
-              {{ t.start_fmt }}{% if t.end_date and t.end_date!=t.start_date %} – {{ t.end_fmt }}{% endif %}
-              {% if t.location %} · {{ t.location }}{% endif %}
-            </small>
-          </div>
-          <svg class="edit-tour-toggle" xmlns="http://www.w3.org/2000/svg" width="20" height="20" fill="var(--accent)" viewBox="0 0 24 24" style="cursor:pointer;">
-            <path d="M3 17.25V21h3.75l11.06-11.06-3.75-3.75L3 17.25zm2.16 1.34l.59-2.36 2.36.59-2.95 1.77zm13.7-10.7l-1.77 1.77-3.75-3.75 1.77-1.77a.996.996 0 011.41 0l2.34 2.34a.996.996 0 010 1.41z"/>
-          </svg>
-        </div>
-        <div class="detail-container">
-          {% if t.link %}
-            <small><a href="{{ t.link }}" target="_blank">{{ t.link }}</a></small>
-          {% endif %}
-          {% if t.description %}
-            <small style="white-space: pre-wrap; display: block;">{{ t.description }}</small>
-          {% endif %}
-        </div>
-        <div class="edit-tour-container">
-          <form method="post" action="{{ url_for('edit_tournament', tid=t.id) }}">
-            <label class="form-label">Link</label>
-            <input name="link" value="{{ t.link or '' }}">
-            <label class="form-label">Beschreibung</label>
-            <textarea name="description" rows="2">{{ t.description or '' }}</textarea>
-            <button class="btn-primary" type="submit">Speichern</button>
-          </form>
-        </div>
-        <div class="card-body">
-          <div class="card-left">
-            <table class="status-table">
-              <thead><tr><th>Teilnehmer</th>{% for d in t.dates %}<th>{{ d.fmt }}</th>{% endfor %}<th>Aktion</th></tr></thead>
-              <tbody>
-                {% for p in t.participants %}
-                <tr>
-                  <td>{{ p.name }}</td>
-                  {% for d in t.dates %}
-                    {% set stat = p.statuses.get(d.iso,'no') %}
-                    <td class="status-{{ stat }}">{% if stat=='attending' %}✓{% elif stat=='interested' %}?{% else %}×{% endif %}</td>
-                  {% endfor %}
-                  <td>
-                    <svg class="edit-btn" xmlns="http://www.w3.org/2000/svg" width="20" height="20" fill="var(--accent)" viewBox="0 0 24 24" style="cursor:pointer;"
-                       title="Bearbeiten"
-                       data-name="{{ p.name }}"
-                       data-statuses='{{ p.statuses|tojson }}'>
-                      <path d="M3 17.25V21h3.75l11.06-11.06-3.75-3.75L3 17.25zm2.16 1.34l.59-2.36 2.36.59-2.95 1.77zm13.7-10.7l-1.77 1.77-3.75-3.75 1.77-1.77a.996.996 0 011.41 0l2.34 2.34a.996.996 0 010 1.41z"/>
-                    </svg>
-                  </td>
-                </tr>
-                {% endfor %}
-              </tbody>
-            </table>
-          </div>
-          <div class="card-right">
-            <form method="post" action="{{ url_for('signup', tid=t.id) }}">
-              <div class="form-group">
-                <input type="text" name="player" list="player_names" placeholder="Max Mustermann" required>
-              </div>
-              {% for d in t.dates %}
-              <div class="status-field">
-                <label class="form-label" for="select_{{ d.iso }}">{{ d.fmt }}</label>
-                <select name="status_{{ d.iso }}" id="select_{{ d.iso }}">
-                  <option value="attending">Angemeldet</option>
-                  <option value="interested">Interesse</option>
-                  <option value="no">keine Teilnahme</option>
-                </select>
-              </div>
-              {% endfor %}
-              <button class="btn-primary" type="submit">Absenden</button>
-            </form>
-          </div>
-        </div>
-      </div>
-    {% endfor %}
-    </div>
-
-    <script>
-    document.addEventListener('DOMContentLoaded', () => {
-      document.body.addEventListener('click', e => {
-        // Toggle tournament edit form
-        if (e.target.classList.contains('edit-tour-toggle')) {
-          const btn = e.target;
-          const card = btn.closest('.card');
-          const container = card.querySelector('.edit-tour-container');
-          if (container) container.classList.toggle('active');
-          return;
-        }
-        // Create toggle
-        if (e.target.classList.contains('create-toggle')) {
-          e.target.nextElementSibling.classList.toggle('active');
-          return;
+def _wants_json():
+    # Forms sent by the page script via fetch() ask for JSON instead of a redirect
+    return request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json"
+
+def _change_event(op):
+    """(event name, payload) for one feed entry, None if nothing is shown."""
+    if op is None or op["op"] in ("create", "delete_tournament"):
+        return "changed", {}
+    if op["op"] == "delete_participant":
+        return "row-removed", {"tid": op["tid"], "pid": op["pid"], "headcounts": _headcounts(op["tid"])}
+    t = STORE.get(op["tid"])
+    if t is None:
+        return None
+    if op["op"] == "edit":
+        return "card", {"tid": t["id"], "html": _render_card(_view(t))}
+    p = STORE.participant(t["id"], op["name"])
+    if p is None:
+        return None
+    return "row", {"tid": t["id"], "pid": p["id"], "name": p["name"],
+                   "statuses": p["statuses"], "html": _render_row(t, p),
+                   "headcounts": _headcounts(t["id"])}
+
+def _headcounts(tid):
+    matrix = STORE.indexes["attendance"].get(tid)
+    return matrix.headcounts() if matrix is not None else []
+
+@app.route("/events", methods=["GET"])
+def events():
+    # Last-Event-ID is sent by the browser when it reconnects. Resolved before
+    # a slot is taken: an abort here (e.g. unknown tenant) must not leak it
+    tick = STORE.feed_tick(request.headers.get("Last-Event-ID", type=int))
+    if not _STREAM_SLOTS.acquire(blocking=False):
+        # EventSource gives up on a 503; the page script falls back to polling
+        return Response(status=503, headers={"Retry-After": str(int(EVENTS_STREAM_SECONDS))})
+
+    def stream():
+        nonlocal tick
+        yield "retry: 3000\n\n"
+        deadline = time.monotonic() + EVENTS_STREAM_SECONDS
+        if tick is None:  # missed changes while disconnected
+            tick = STORE.feed_tick(None)
+            yield f"id: {STORE.seq}\nevent: changed\ndata: {{}}\n\n"
+        while time.monotonic() < deadline:
+            entries = STORE.wait_changes(tick, min(EVENTS_KEEPALIVE_SECONDS, deadline - time.monotonic()))
+            if not entries:
+                yield ": keepalive\n\n"
+                continue
+            for tick, seq, op in entries:
+                event = _change_event(op)
+                if event is not None:
+                    yield f"id: {seq}\nevent: {event[0]}\ndata: {json.dumps(event[1])}\n\n"
+
+    try:
+        resp = Response(stream_with_context(stream()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        resp.call_on_close(_STREAM_SLOTS.release)
+    except BaseException:
+        _STREAM_SLOTS.release()
+        raise
+    return resp
+
+@app.route("/events/poll", methods=["GET"])
+@_conditional
+def events_poll():
+    """Changes after sequence number `since` as {"seq": ..., "events": [...]};
+    without `since` only the current sequence number to start from."""
+    since = request.args.get("since", type=int)
+    tick = STORE.feed_tick(since)
+    if tick is None:  # fell out of the feed: the page has to reload
+        entries = [(STORE.tick, STORE.seq, None)]
+    else:
+        entries = STORE.wait_changes(tick, 0) if since is not None else []
+    events = []
+    for _, seq, op in entries:
+        event = _change_event(op)
+        if event is not None:
+            events.append({"seq": seq, "event": event[0], "data": event[1]})
+    return jsonify(seq=STORE.seq, events=events)
+
+# ---------- Calendar Feeds ----------
+# Calendar apps poll often: the ETag is known before anything is built, so
+# most polls end in a 304, and built feeds are cached per data version.
+@app.route("/calendar.ics", methods=["GET"])
+def calendar_feed():
+    return _feed("all", lambda stamp: feeds.calendar("Turniere", (
+        _feed_event(t.id, t.name, t.start, t.end, stamp, t) for t in _upcoming())))
+
+@app.route("/calendar/<participant>.ics", methods=["GET"])
+def participant_feed(participant):
+    def build(stamp):
+        events = []
+        for tid, p in STORE.by_name.get(participant.lower(), {}).items():
+            t = VIEWS.get(STORE, tid)
+            row = t and t.participant(p["id"])
+            if row is None:
+                continue
+            days = [t.start + dt.timedelta(days=i) for i in range(len(t.dates))]
+            for first, last, status in feeds.runs(days, row.cells):
+                summary = t.name if status == "attending" else f"{t.name} (Interesse)"
+                events.append((first, _feed_event(f"{tid}-{p['id']}-{first:%Y%m%d}", summary,
+                                                  first, last, stamp, t)))
+        events.sort(key=lambda e: e[0])
+        return feeds.calendar(f"Turniere – {participant}", (e for _, e in events))
+    return _feed("participant:" + participant.lower(), build)
+
+def _feed_event(uid, summary, first, last, stamp, t):
+    return feeds.event(f"{uid}@turnierverwaltung", summary, first, last, stamp,
+                       t.location, t.link, t.description)
+
+def _feed(key, build):
+    today = _today()
+    STORE.refresh()
+    etag = hashlib.sha1("|".join((key, STORE.version(), today.isoformat())).encode("utf8")).hexdigest()
+    # Newest data file, but not before midnight: the upcoming window moves daily
+    newest = max([p.stat().st_mtime for p in _data_paths()]
+                 + [dt.datetime.combine(today, dt.time()).timestamp()])
+    modified = dt.datetime.fromtimestamp(int(newest), dt.timezone.utc)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=modified):
+        resp = Response(status=304)
+    else:
+        body = FEEDS.get(etag)
+        if body is None:
+            body = build(modified)
+            FEEDS.put(etag, body)
+        resp = Response(body, mimetype="text/calendar")
+    resp.set_etag(etag)
+    resp.last_modified = modified
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+# ---------- JSON API ----------
+@app.route("/api/search", methods=["GET"])
+def api_search():
+    query = request.args.get("q", "").strip()
+    ids = STORE.search(query)
+    return jsonify(sorted((
+        {
+            "id": t["id"],
+            "name": t["name"],
+            "start_date": str(t["start_date"]),
+            "end_date": str(t["end_date"]),
+            "location": t.get("location", ""),
         }
-        // Edit participant: prefill signup form
-        const pbtn = e.target.closest('.edit-btn');
-        if (pbtn) {
-          const btn = pbtn;
-          const card = btn.closest('.card');
-          const form = card.querySelector('form[action*="signup"]');
-          const statuses = JSON.parse(btn.getAttribute('data-statuses'));
-          // Prefill name
-          form.querySelector('input[name="player"]').value = btn.getAttribute('data-name');
-          // Prefill statuses
-          Object.entries(statuses).forEach(([date, stat]) => {
-            const sel = form.querySelector('select[name="status_' + date + '"]');
-            if (sel) sel.value = stat;
-          });
-          form.scrollIntoView({ behavior: 'smooth' });
-          return;
+        for t in map(STORE.by_id.get, ids) if t is not None
+    ), key=lambda t: t["start_date"]))
+
+@app.route("/api/signups", methods=["POST"])
+def api_signups():
+    """Apply many signups at once: [{tournament_id, player, statuses}, ...].
+    Valid entries are persisted in a single write; every entry gets a result."""
+    payload = request.get_json(silent=True)
+    entries = payload.get("signups") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        return jsonify({"error": "Erwartet eine Liste von Anmeldungen."}), 400
+    results = []
+
+    def build(tournaments):
+        # Under the write lock: no tournament can vanish between check and write
+        ops = []
+        for i, entry in enumerate(entries):
+            try:
+                op = _signup_op(entry)
+            except ValueError as e:
+                results.append({"index": i, "ok": False, "error": str(e)})
+                continue
+            ops.append(op)
+            results.append({"index": i, "ok": True, "tournament_id": op["tid"], "player": op["name"]})
+        return ops
+
+    ops = STORE.apply_with(build)
+    return jsonify({"applied": len(ops), "results": results})
+
+def _signup_op(entry):
+    if not isinstance(entry, dict):
+        raise ValueError("Eintrag muss ein Objekt sein.")
+    tid, player = entry.get("tournament_id"), entry.get("player") or ""
+    t = STORE.by_id.get(tid) if isinstance(tid, str) else None
+    if t is None:
+        raise ValueError("Unbekanntes Turnier.")
+    if not isinstance(player, str):
+        raise ValueError("player muss ein Text sein.")
+    player = player.strip()
+    if not player:
+        raise ValueError("Bitte einen Namen angeben.")
+    statuses = entry.get("statuses") or {}
+    if not isinstance(statuses, dict):
+        raise ValueError("statuses muss ein Objekt {Datum: Status} sein.")
+    start, end = _parse(t["start_date"]), _parse(t["end_date"])
+    normalized = {}
+    for day, status in statuses.items():
+        try:
+            date = _parse(day)
+            if not start <= date <= end:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError(f"Datum {day} liegt nicht im Turnierzeitraum.") from None
+        if status not in STATUSES:
+            raise ValueError(f"Unbekannter Status: {status}")
+        # Matrix, cells and headcounts are keyed by ISO date ("2099-5-1" parses too)
+        normalized[date.isoformat()] = status
+    return {"op": "signup", "tid": t["id"], "pid": uuid.uuid4().hex,
+            "name": player, "statuses": normalized}
+
+@app.route("/api/headcounts", methods=["GET"])
+def api_headcounts():
+    """Per-day attending/interested counts of all upcoming tournaments."""
+    upcoming, _ = STORE.split(_border().isoformat())
+    return jsonify(sorted((
+        {
+            "id": t["id"],
+            "name": t["name"],
+            "start_date": str(t["start_date"]),
+            "end_date": str(t["end_date"]),
+            "days": _headcounts(t["id"]),
         }
-      });
-    });
-    </script>
-    </body></html>
-    """
+        for t in upcoming
+    ), key=lambda t: t["start_date"]))
+
+@app.route("/api/names", methods=["GET"])
+def api_names():
+    prefix = request.args.get("prefix", "").strip()
+    limit = min(request.args.get("limit", 10, type=int) or 10, NAME_SUGGESTIONS_MAX)
+    if not prefix:
+        return jsonify([])
+    STORE.refresh()
+    return jsonify(STORE.indexes["names"].complete(prefix, limit))
+
+# ---------- Static Files & Compression ----------
+def _accepted_encodings():
+    return {encoding for encoding, quality in request.accept_encodings if quality > 0}
+
+@app.route("/static/<name>", methods=["GET"])
+def asset(name):
+    found = ASSETS.get(name)
+    if found is None:
+        abort(404)
+    encoding, body = found.encoded(_accepted_encodings())
+    resp = Response(body, mimetype=found.mimetype)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+@app.after_request
+def _compress(resp):
+    if (resp.status_code == 304 or resp.direct_passthrough
+            or "Content-Encoding" in resp.headers
+            or resp.mimetype not in ("text/html", "application/json", "text/calendar")):
+        return resp
+    resp.vary.add("Accept-Encoding")
+    if resp.is_streamed:  # pages, see _render_page()
+        encoding, chunks = compress_stream(resp.iter_encoded(), _accepted_encodings())
+        if encoding:
+            resp.response = chunks
+    else:
+        encoding, body = compress(resp.get_data(), _accepted_encodings())
+        if encoding:
+            resp.set_data(body)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+        etag, weak = resp.get_etag()
+        if etag and not weak:  # the bytes differ per encoding
+            resp.set_etag(etag, weak=True)
+    return resp
+
+# ---------- Health ----------
+def warm():
+    """Load the data and build the per-version indexes (called per worker).
+    With tenants only the default one; the others load on first request."""
+    if TENANTS.default is not None:
+        STORE.refresh()
+        _intervals()
+        _by_start()
+    READY["data"] = True
+
+@app.before_request
+def _warm_on_first_request():
+    # flask run has no post_worker_init hook (gunicorn.conf.py): the first
+    # request warms up instead, within that request's tenant
+    if not READY["data"]:
+        warm()
+
+@app.route("/healthz/ready", methods=["GET"])
+def ready():
+    ok = all(READY.values())
+    return jsonify(dict(READY, ready=ok, tenants=len(TENANTS.loaded()))), 200 if ok else 503
+
+# ---------- Stats ----------
+@app.route("/api/cache_stats", methods=["GET"])
+def cache_stats():
+    return jsonify({"fragments": FRAGMENTS.stats()})
+
+# ---------- Metrics ----------
+# cProfile allows one enabled profiler per process (on Python 3.12+ it runs on
+# sys.monitoring) and records every thread, not just the request's. So only
+# one request is profiled at a time; the others are counted as skipped, and
+# a report may still show frames of requests served alongside it.
+_PROFILING = threading.Lock()
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+    g.profiler = None
+    g.profile_forced = bool(request.headers.get("X-Profile") and _is_admin())
+    # Live-update streams are slow by design and would hold the profiler for minutes
+    if (PROFILE_SLOW_MS > 0 or g.profile_forced) and request.endpoint != "events":
+        if not _PROFILING.acquire(blocking=False):
+            PROFILES_SKIPPED.inc()
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # a profiler from outside the app, e.g. python -m cProfile
+            _PROFILING.release()
+            PROFILES_SKIPPED.inc()
+            return
+        g.profiler = profiler
+
+@app.after_request
+def _record_request(resp):
+    start = g.pop("request_start", None)
+    if start is None:
+        return resp
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    method, status, request_line = request.method, resp.status_code, f"{request.method} {request.full_path}"
+    profiler, forced = g.pop("profiler", None), g.profile_forced
+    report = _profile_path() if profiler is not None else None
+
+    def finish():
+        # True if a profile report was written
+        elapsed = time.perf_counter() - start
+        REQUESTS.inc(route=route, method=method, status=status)
+        REQUEST_SECONDS.observe(elapsed, route=route, method=method)
+        if profiler is None:
+            return False
+        profiler.disable()
+        _PROFILING.release()
+        if not forced and elapsed * 1000 < PROFILE_SLOW_MS:
+            return False
+        _dump_profile(profiler, elapsed, request_line, report)
+        return True
+
+    if resp.is_streamed:
+        # Pages are rendered while they are sent: measure until the last byte
+        resp.call_on_close(finish)
+        if forced:
+            resp.headers["X-Profile-Report"] = report.name
+    elif finish():
+        resp.headers["X-Profile-Report"] = report.name
+    return resp
+
+@app.teardown_request
+def _stop_profiler(exc):
+    # Only left in g if _record_request() did not run
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _PROFILING.release()
+
+def _profile_path():
+    stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return PROFILE_DIR / f"{stamp}-{request.endpoint or 'unmatched'}.txt"
+
+def _dump_profile(profiler, elapsed, request_line, path):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf8") as f:
+        f.write(f"{request_line} {elapsed * 1000:.1f} ms\n\n")
+        pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(50)
+    logging.getLogger(__name__).warning("slow request %s (%.1f ms), profile: %s",
+                                        request_line, elapsed * 1000, path)
+
+def _data_paths():
+    backend = STORE.backend
+    paths = [backend.path, getattr(backend, "journal", None), Path(f"{backend.path}-wal")]
+    return [p for p in paths if p is not None and p.exists()]
+
+def _data_files():
+    return {(p.name,): p.stat().st_size for p in _data_paths()}
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    STORE.refresh()
+    caches = {"fragments": FRAGMENTS.stats(), "cold_years": COLD.stats()}
+    gauges = [
+        ("data_file_bytes", "Size of the data files.", ("file",), _data_files()),
+        ("tournaments", "Tournaments in the hot data.", (), {(): len(STORE.by_id)}),
+        ("participants", "Participants over all hot tournaments.", (), {(): len(STORE.by_pid)}),
+        ("data_sequence", "Sequence number of the last applied change.", (), {(): STORE.seq}),
+        ("cache_hit_ratio", "Hit ratio of the in-process caches.", ("cache",),
+         {(name,): s["hit_ratio"] for name, s in caches.items()}),
+        ("cache_entries", "Entries in the in-process caches.", ("cache",),
+         {(name,): s["size"] for name, s in caches.items()}),
+        ("tenant_memory_bytes", "Estimated memory of the loaded tenants.", ("tenant",),
+         {(t.name,): t.memory() for t in TENANTS.loaded()}),
+    ]
+    return Response(metrics.render(metrics.ALL, gauges),
+                    mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+# ---------- CLI ----------
+# --tenant picks a tenant from tenants.yaml, otherwise the default files
+_tenant_option = click.option("--tenant", help="Name of a tenant in tenants.yaml.")
+
+def _cli_tenant(name):
+    if name is None:
+        return None
+    if name not in TENANTS.configs:
+        raise click.BadParameter(f"unknown tenant: {name}", param_hint="--tenant")
+    return TENANTS.configs[name]
+
+@app.cli.command("import-yaml")
+@click.argument("source", required=False)
+@_tenant_option
+def import_yaml(source, tenant):
+    """Import data.yaml (incl. pending journal) into the SQLite database."""
+    config = _cli_tenant(tenant)
+    sqlite_file = config.sqlite_file if config else SQLITE_FILE
+    yaml_store = DataStore(YamlBackend(source or (config.data_file if config else DATA_FILE)))
+    yaml_store.refresh()
+    SqliteBackend(sqlite_file).replace_all(yaml_store.data, yaml_store.seq)
+    click.echo(f"{len(yaml_store.data['tournaments'])} Turniere nach {sqlite_file} importiert.")
+
+@app.cli.command("export-yaml")
+@click.argument("target", required=False)
+@_tenant_option
+def export_yaml(target, tenant):
+    """Export the SQLite database back into a data.yaml file."""
+    config = _cli_tenant(tenant)
+    target = target or (config.data_file if config else DATA_FILE)
+    sqlite_store = DataStore(SqliteBackend(config.sqlite_file if config else SQLITE_FILE))
+    sqlite_store.refresh()
+    YamlBackend(target).compact(sqlite_store.data, sqlite_store.seq)
+    click.echo(f"{len(sqlite_store.data['tournaments'])} Turniere nach {target} exportiert.")
+
+@app.cli.command("archive-cold")
+@click.option("--days", default=COLD_AFTER_DAYS, show_default=True,
+              help="Move tournaments that ended more than this many days ago.")
+@_tenant_option
+def archive_cold(days, tenant):
+    """Move old tournaments out of the hot data into per-year archive files."""
+    cutoff = (_today() - dt.timedelta(days=max(days, PAST_KEEP_DAYS))).isoformat()
+    if tenant is None:
+        store, cold = STORE, COLD
+    else:
+        t = TENANTS.get(_cli_tenant(tenant).name)
+        store, cold = t.store, t.cold
+    moved = move_cold(store, cold, cutoff)
+    click.echo(f"{moved} Turniere nach {cold.dir} verschoben.")
+
+# ---------- Template ----------
+def _render_page(tournaments, archive=False, filter_name="", entries=(), **page_args):
+    """Streamed page: header, filter and calendar are sent first, then the
+    cards one at a time as they are rendered, so neither the time to the
+    first byte nor the memory held depends on the number of tournaments."""
+    with RENDER_SECONDS.time(part="calendar"):
+        months = _calendar_months(tournaments)
+    args = dict(page_args, archive=archive, filter_name=filter_name, calendar_months=months,
+                events_poll_seconds=EVENTS_POLL_SECONDS)
+
+    def generate():
+        with RENDER_SECONDS.time(part="page"):
+            head = render_template("page_head.html", **args)
+        yield head
+        if archive:
+            yield from stream_template("archive_page.html", **dict(
+                args, entries=((year, _timed_card(t)) for year, t in entries)))
+        else:
+            for t in tournaments:
+                yield _timed_card(t)
+        yield render_template("page_foot.html", **args)
+
+    return Response(stream_with_context(generate()), mimetype="text/html",
+                    headers={"X-Accel-Buffering": "no"})
+
+def _timed_card(t):
+    # Timed per card: the stream also waits for the client in between
+    start = time.perf_counter()
+    card = _render_card(t)
+    RENDER_SECONDS.observe(time.perf_counter() - start, part="card")
+    return card
+
+def _calendar_months(tournaments):
     # ----- Build calendar: start with first upcoming tournament month, show 4 months -----
     today = _today()
     # Determine the first month to display (first month with an upcoming or ongoing tournament)
-    if tournaments:
-        next_start = min(
-            _parse(t["start_date"])
-            for t in tournaments
-            if _parse(t["end_date"]) >= today
-        )
-        first_month_date = next_start.replace(day=1)
-    else:
-        first_month_date = today.replace(day=1)
+    next_start = min(
+        (t.start for t in tournaments if t.end >= today),
+        default=today
+    )
+    first_month_date = next_start.replace(day=1)
+    cal = calendar.Calendar(firstweekday=0)
+    month_dates = [
+        (first_month_date + dt.timedelta(days=32 * m_offset)).replace(day=1)
+        for m_offset in range(4)  # show exactly 4 months on desktop
+    ]
+    # One index lookup for the whole visible range instead of a scan per day
+    grid = [cal.monthdatescalendar(m.year, m.month) for m in month_dates]
+    names = {t.id: t.name for t in tournaments}
+    by_day = _intervals().by_day(grid[0][0][0], grid[-1][-1][-1])
     months = []
-    for m_offset in range(4):  # show exactly 4 months on desktop
-        month_date = (first_month_date + dt.timedelta(days=32 * m_offset)).replace(day=1)
-        year, month = month_date.year, month_date.month
-        month_name = month_date.strftime("%B %Y")
-        cal = calendar.Calendar(firstweekday=0)
+    for month_date, month_weeks in zip(month_dates, grid):
+        month = month_date.month
         weeks = []
-        for week in cal.monthdatescalendar(year, month):
+        for week in month_weeks:
             week_cells = []
             for d in week:
-                iso = d.isoformat()
-                has_t = next((t for t in tournaments if iso >= t['start_date'] and iso <= t['end_date']), None)
+                tids = [tid for tid in by_day.get(d.toordinal(), ()) if tid in names]
                 week_cells.append({
                     "day": d.day if d.month == month else "",
-                    "iso": iso,
-                    "active": bool(has_t),
-                    "tid": has_t["id"] if has_t else ""
+                    "iso": d.isoformat(),
+                    "active": bool(tids),
+                    "tids": tids,
+                    "names": [names[tid] for tid in tids]
                 })
             weeks.append(week_cells)
-        months.append({"name": month_name, "weeks": weeks})
-    all_names = sorted({p['name'] for t in _load()['tournaments'] for p in t['participants']})
-    return render_template_string(base_tpl,
-                                  tournaments=tournaments,
-                                  archive=archive,
-                                  filter_name=filter_name,
-                                  all_names=all_names,
-                                  calendar_months=months)
+        months.append({"name": month_date.strftime("%B %Y"), "weeks": weeks})
+    return months
+
+def _render_row(stored, p):
+    t = _view(stored)
+    return render_template("status_row.html", t=t, p=t.participant(p["id"]))
+
+def _render_card(t):
+    key = (t.id, t.version)
+    card = FRAGMENTS.get(key)
+    if card is None:
+        card = Markup(render_template("card.html", t=t))
+        FRAGMENTS.put(key, card)
+    return card
 
 if __name__ == "__main__":
+    warm()
     print("📣 Starte Turnierverwaltung auf http://127.0.0.1:8002")
     app.run(debug=True, host="0.0.0.0", port=8002)
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Turnierverwaltung – statische Dateien
+CSS, JS und das SVG-Sprite aus static/ werden beim Start eingelesen, mit
+einem Inhalts-Hash im Dateinamen versehen und gzip-/brotli-komprimiert im
+Speicher gehalten. Die Namen ändern sich mit dem Inhalt, daher dürfen
+Browser sie unbegrenzt cachen.
+"""
+import gzip, hashlib, mimetypes, zlib
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = 512
+
+def compress(body, accepted, level=6):
+    """(encoding, compressed body) for the best of the `accepted` encodings,
+    or (None, body) if none fits or it would not pay off."""
+    if len(body) < COMPRESS_MIN_BYTES:
+        return None, body
+    if brotli is not None and "br" in accepted:
+        return "br", brotli.compress(body, quality=level - 1)
+    if "gzip" in accepted:
+        return "gzip", gzip.compress(body, compresslevel=level, mtime=0)
+    return None, body
+
+def compress_stream(chunks, accepted, level=6):
+    """(encoding, compressed chunks) like compress(), for a body that is
+    still being produced: every chunk is flushed so that it reaches the
+    client right away."""
+    if brotli is not None and "br" in accepted:
+        compressor = brotli.Compressor(quality=level - 1)
+        def generate():
+            for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        return "br", generate()
+    if "gzip" in accepted:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip framing
+        def generate():
+            for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+        return "gzip", generate()
+    return None, chunks
+
+class Asset:
+    __slots__ = ("name", "mimetype", "body", "variants")
+
+    def __init__(self, name, mimetype, body):
+        self.name, self.mimetype, self.body = name, mimetype, body
+        # Built once at startup, so spend the time on the best ratio
+        self.variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+
+    def encoded(self, accepted):
+        """(encoding, body) of the smallest variant among `accepted` encodings."""
+        best = (None, self.body)
+        for encoding, body in self.variants.items():
+            if encoding in accepted and len(body) < len(best[1]):
+                best = (encoding, body)
+        return best
+
+class Assets:
+    def __init__(self, directory):
+        self._urls = {}    # file name -> fingerprinted name
+        self._assets = {}  # fingerprinted name -> Asset
+        for path in sorted(Path(directory).glob("*.*")):
+            body = path.read_bytes()
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            name = f"{path.stem}.{digest}{path.suffix}"
+            mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            self._urls[path.name] = name
+            self._assets[name] = Asset(name, mimetype, body)
+        # Changes with any asset; pages that link them must change too
+        self.version = hashlib.sha256(" ".join(sorted(self._assets)).encode()).hexdigest()[:12]
+
+    def fingerprinted(self, name):
+        return self._urls[name]
+
+    def get(self, fingerprinted_name):
+        return self._assets.get(fingerprinted_name)
@@ -0,0 +1,444 @@
+"""
+Turnierverwaltung – Persistenz-Backends
+YamlBackend:   data.yaml als Snapshot + Journal (Standard); daneben liegt
+               ein binärer Abzug (data.yaml.bin, marshal), der nur schneller lädt
+SqliteBackend: Tabellen für Turniere, Teilnehmer und Tagesstatus mit Indizes
+
+Beide liefern dieselbe Schnittstelle an den DataStore:
+stamp(), lock(), load(), changes(), append(), needs_compaction(), compact().
+"""
+import os, json, marshal, hashlib, sqlite3, tempfile, threading, yaml
+import datetime as dt
+from contextlib import contextmanager
+from pathlib import Path
+from metrics import PERSISTENCE_SECONDS
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, run a single worker only
+    fcntl = None
+
+JOURNAL_COMPACT_BYTES = 256 * 1024
+SQLITE_KEEP_CHANGES = 1000
+
+# ---------- YAML Persistence ----------
+# The YAML file is the source of truth. Every parse or write also leaves a
+# marshalled copy next to it, keyed by the YAML file's size and content hash,
+# so hand edits invalidate it by themselves (mtimes can be too coarse for
+# that). marshal only rebuilds plain data, unlike pickle it cannot be made to
+# run code by whoever can write the data directory.
+def load_yaml(path):
+    path = Path(path)
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return {"tournaments": []}
+    key = (len(raw), hashlib.sha1(raw).hexdigest())
+    data = _load_snapshot(path, key)
+    if data is None:
+        with PERSISTENCE_SECONDS.time(operation="yaml_load"):
+            data = yaml.load(raw, Loader=SafeLoader) or {"tournaments": []}
+        _save_snapshot(path, key, data)
+    return data
+
+def save_yaml(path, data):
+    """Write atomically: temp file, fsync, rename over the old file."""
+    path = Path(path)
+    with PERSISTENCE_SECONDS.time(operation="yaml_dump"):
+        raw = yaml.dump(data, Dumper=SafeDumper, allow_unicode=True, sort_keys=False).encode("utf8")
+    # Unique temp name: more than one process may write the same file
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp, 0o644)  # mkstemp's 0600 would lock out other readers
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _fsync_dir(path.parent)
+    _save_snapshot(path, (len(raw), hashlib.sha1(raw).hexdigest()), data)
+
+def _snapshot_file(path):
+    return path.with_name(path.name + ".bin")
+
+# Dates are the only values safe_load produces that marshal cannot store;
+# they travel as tuples, which YAML never yields
+def _encode(value):
+    if isinstance(value, dict):
+        return {_encode(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dt.datetime):
+        return ("datetime", value.isoformat())
+    if isinstance(value, dt.date):
+        return ("date", value.isoformat())
+    return value
+
+def _decode(value):
+    if isinstance(value, dict):
+        return {_decode(k): _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, tuple):
+        return (dt.datetime if value[0] == "datetime" else dt.date).fromisoformat(value[1])
+    return value
+
+def _has_dates(value):
+    if isinstance(value, dict):
+        return any(_has_dates(k) or _has_dates(v) for k, v in value.items())
+    if isinstance(value, list):
+        return any(_has_dates(v) for v in value)
+    return isinstance(value, dt.date)
+
+def _load_snapshot(path, key):
+    """Data of the binary snapshot if it was taken of exactly this YAML content."""
+    try:
+        with _snapshot_file(path).open("rb") as f:
+            if marshal.load(f) != key:
+                return None
+            with PERSISTENCE_SECONDS.time(operation="snapshot_load"):
+                dates, data = marshal.load(f), marshal.load(f)
+                return _decode(data) if dates else data
+    except Exception:  # missing, truncated or from an incompatible version
+        return None
+
+def _save_snapshot(path, key, data):
+    # Only a cache: no fsync; unique temp name as every worker may write it
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    except OSError:  # read-only directory: just go without
+        return
+    try:
+        dates = _has_dates(data)
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(key, f)
+            marshal.dump(dates, f)
+            marshal.dump(_encode(data) if dates else data, f)
+        os.replace(tmp, _snapshot_file(path))
+    except Exception:  # e.g. a value marshal cannot store: go without
+        os.unlink(tmp)
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _filestat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+@contextmanager
+def _flock(path, exclusive=True):
+    """Cross-process lock; a no-op where fcntl is unavailable."""
+    with open(path, "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def try_lock(path):
+    """Exclusive cross-process lock on `path` without waiting: the open file,
+    which holds the lock until it is closed, or None if another process has it."""
+    f = open(path, "a")
+    if fcntl:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return None
+    return f
+
+class YamlBackend:
+    """data.yaml snapshot plus an append-only JSON-lines journal."""
+    name = "yaml"
+
+    def __init__(self, path, compact_bytes=JOURNAL_COMPACT_BYTES):
+        self.path = Path(path)
+        self.journal = self.path.with_name(self.path.name + ".journal")
+        self.lockfile = self.path.with_name(self.path.name + ".lock")
+        self.compact_bytes = compact_bytes
+        self._snapshot = None  # stat of data.yaml at the last load
+        self._offset = 0       # bytes of the journal already read
+
+    def stamp(self):
+        return (_filestat(self.path), _filestat(self.journal))
+
+    def lock(self, exclusive=True):
+        return _flock(self.lockfile, exclusive)
+
+    def load(self):
+        data = load_yaml(self.path)
+        data.setdefault("tournaments", [])
+        seq = data.pop("seq", 0)
+        self._snapshot = _filestat(self.path)
+        self._offset = 0
+        return data, seq
+
+    def changes(self, since):
+        """Journal records not read yet, or None if the snapshot must be reloaded."""
+        journal = _filestat(self.journal)
+        if _filestat(self.path) != self._snapshot or (journal and journal[1] < self._offset):
+            return None
+        records = []
+        try:
+            f = self.journal.open("rb")
+        except FileNotFoundError:
+            return records
+        with f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash, ignore the tail
+                self._offset += len(line)
+                rec = json.loads(line)
+                records.append((rec["seq"], rec["op"]))
+        return records
+
+    def append(self, records):
+        lines = "".join(json.dumps({"seq": seq, "op": op}, ensure_ascii=False) + "\n"
+                        for seq, op in records)
+        with PERSISTENCE_SECONDS.time(operation="journal_append"), self.journal.open("ab") as f:
+            # Called under the exclusive lock right after changes(), so anything
+            # past the last complete line is a torn write: drop it, or the new
+            # records would be glued onto it
+            if f.seek(0, os.SEEK_END) > self._offset:
+                f.truncate(self._offset)
+            f.write(lines.encode("utf8"))
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+
+    def needs_compaction(self):
+        return self._offset > self.compact_bytes
+
+    def compact(self, data, seq):
+        """Fold everything into data.yaml and start a fresh journal."""
+        save_yaml(self.path, {"seq": seq, **data})
+        # A crash right here is harmless: records up to `seq` are skipped on replay
+        with self.journal.open("wb") as f:
+            os.fsync(f.fileno())
+        self._snapshot = _filestat(self.path)
+        self._offset = 0
+
+# ---------- SQLite Persistence ----------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    location TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS participants (
+    id TEXT PRIMARY KEY,
+    tid TEXT NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS statuses (
+    pid TEXT NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (pid, day)
+);
+CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY, op TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS ix_tournaments_start ON tournaments(start_date);
+CREATE INDEX IF NOT EXISTS ix_tournaments_end ON tournaments(end_date);
+CREATE INDEX IF NOT EXISTS ix_participants_name ON participants(name_lower);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_participants_tid_name ON participants(tid, name_lower);
+"""
+
+class SqliteBackend:
+    """Normalized tables; changes are applied as row updates plus a change log."""
+    name = "sqlite"
+
+    def __init__(self, path, keep_changes=SQLITE_KEEP_CHANGES):
+        self.path = Path(path)
+        self.keep_changes = keep_changes
+        self._local = threading.local()
+        self._generation = None
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def stamp(self):
+        return self._conn().execute(
+            "SELECT (SELECT value FROM meta WHERE key='generation'),"
+            " (SELECT MAX(seq) FROM changes)").fetchone()
+
+    @contextmanager
+    def lock(self, exclusive=True):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE" if exclusive else "BEGIN")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def load(self):
+        with PERSISTENCE_SECONDS.time(operation="sqlite_load"):
+            return self._load()
+
+    def _load(self):
+        conn = self._conn()
+        tournaments, by_id, by_pid = [], {}, {}
+        for row in conn.execute("SELECT id, name, start_date, end_date, location, link,"
+                                " description FROM tournaments ORDER BY rowid"):
+            t = dict(zip(("id", "name", "start_date", "end_date", "location", "link",
+                          "description"), row), participants=[])
+            tournaments.append(t)
+            by_id[t["id"]] = t
+        for pid, tid, name in conn.execute("SELECT id, tid, name FROM participants ORDER BY rowid"):
+            p = {"id": pid, "name": name, "statuses": {}}
+            by_id[tid]["participants"].append(p)
+            by_pid[pid] = p
+        for pid, day, status in conn.execute("SELECT pid, day, status FROM statuses ORDER BY rowid"):
+            by_pid[pid]["statuses"][day] = status
+        self._generation = self.stamp()[0]
+        return {"tournaments": tournaments}, self._seq()
+
+    def _seq(self):
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0] \
+            or int(self._meta("seq") or 0)
+
+    def _meta(self, key, value=None):
+        conn = self._conn()
+        if value is None:
+            row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+            return row[0] if row else None
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def changes(self, since):
+        """Change log entries after `since`, or None if they were pruned already."""
+        if self.stamp()[0] != self._generation:
+            return None
+        rows = self._conn().execute("SELECT seq, op FROM changes WHERE seq > ? ORDER BY seq",
+                                    (since,)).fetchall()
+        if rows and rows[0][0] != since + 1:
+            return None
+        return [(seq, json.loads(op)) for seq, op in rows]
+
+    def append(self, records):
+        conn = self._conn()
+        with PERSISTENCE_SECONDS.time(operation="sqlite_append"):
+            for seq, op in records:
+                self._apply_sql(conn, op)
+                conn.execute("INSERT INTO changes (seq, op) VALUES (?, ?)",
+                             (seq, json.dumps(op, ensure_ascii=False)))
+
+    def _apply_sql(self, conn, op):
+        kind = op["op"]
+        if kind == "create":
+            self._insert_tournament(conn, op["tournament"])
+        elif kind == "signup":
+            row = conn.execute("SELECT id FROM participants WHERE tid=? AND name_lower=?",
+                               (op["tid"], op["name"].lower())).fetchone()
+            if row:
+                pid = row[0]
+                conn.execute("DELETE FROM statuses WHERE pid=?", (pid,))
+            elif conn.execute("SELECT 1 FROM tournaments WHERE id=?", (op["tid"],)).fetchone():
+                pid = op["pid"]
+                conn.execute("INSERT INTO participants (id, tid, name, name_lower) VALUES (?, ?, ?, ?)",
+                             (pid, op["tid"], op["name"], op["name"].lower()))
+            else:
+                return
+            conn.executemany("INSERT INTO statuses (pid, day, status) VALUES (?, ?, ?)",
+                             [(pid, day, status) for day, status in op["statuses"].items()])
+        elif kind == "edit":
+            conn.execute("UPDATE tournaments SET link=?, description=? WHERE id=?",
+                         (op["link"], op["description"], op["tid"]))
+        elif kind == "delete_tournament":
+            conn.execute("DELETE FROM tournaments WHERE id=?", (op["tid"],))
+        elif kind == "delete_participant":
+            conn.execute("DELETE FROM participants WHERE id=? AND tid=?", (op["pid"], op["tid"]))
+        else:
+            raise ValueError(f"unknown operation: {kind}")
+
+    def _insert_tournament(self, conn, t):
+        conn.execute(
+            "INSERT OR IGNORE INTO tournaments (id, name, start_date, end_date, location, link,"
+            " description) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (t["id"], t["name"], str(t["start_date"]), str(t["end_date"]), t.get("location") or "",
+             t.get("link") or "", t.get("description") or ""))
+        for p in t.get("participants", []):
+            conn.execute("INSERT INTO participants (id, tid, name, name_lower) VALUES (?, ?, ?, ?)",
+                         (p["id"], t["id"], p["name"], p["name"].lower()))
+            conn.executemany("INSERT INTO statuses (pid, day, status) VALUES (?, ?, ?)",
+                             [(p["id"], str(day), status)
+                              for day, status in (p.get("statuses") or {}).items()])
+
+    def needs_compaction(self):
+        # Pruning keeps `keep_changes` rows, so it runs every `keep_changes` writes
+        rows = self._conn().execute("SELECT MAX(seq) - MIN(seq) + 1 FROM changes").fetchone()[0]
+        return (rows or 0) > 2 * self.keep_changes
+
+    def compact(self, data, seq):
+        """Prune the change log; the tables already hold the full state."""
+        self._conn().execute("DELETE FROM changes WHERE seq <= ?", (seq - self.keep_changes,))
+
+    def replace_all(self, data, seq):
+        """Import a complete data set (used by `flask import-yaml`)."""
+        conn = self._conn()
+        with self.lock():
+            for table in ("statuses", "participants", "tournaments", "changes"):
+                conn.execute(f"DELETE FROM {table}")
+            for t in data["tournaments"]:
+                self._insert_tournament(conn, t)
+            self._meta("seq", seq)
+            self._meta("generation", os.urandom(8).hex())
+
+    # ----- Indexed queries -----
+    def tournament_ids(self, since=None, until=None):
+        """Ids of tournaments with since <= end_date < until (ISO strings)."""
+        sql, args = "SELECT id FROM tournaments WHERE 1", []
+        if since is not None:
+            sql += " AND end_date >= ?"
+            args.append(since)
+        if until is not None:
+            sql += " AND end_date < ?"
+            args.append(until)
+        return [row[0] for row in self._conn().execute(sql, args)]
+
+def open_backend(kind, yaml_path, sqlite_path, compact_bytes=JOURNAL_COMPACT_BYTES):
+    if kind == "sqlite":
+        return SqliteBackend(sqlite_path)
+    if kind == "yaml":
+        return YamlBackend(yaml_path, compact_bytes)
+    raise ValueError(f"unknown storage backend: {kind}")
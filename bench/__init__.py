@@ -0,0 +1,3 @@
+"""
+Turnierverwaltung – Benchmarks (python -m bench.run --help)
+"""
@@ -0,0 +1,57 @@
+"""
+Turnierverwaltung – synthetische Testdaten
+Schreibt eine data.yaml mit frei wählbarer Zahl an Turnieren, Tagen pro
+Turnier und Teilnehmern. Die Turniere verteilen sich über die zwei Jahre
+vor und das Jahr nach heute, damit Übersicht und Archiv gefüllt sind.
+
+    python -m bench.generate data.yaml --tournaments 1000 --days 3 --participants 20
+"""
+import argparse, random, uuid, datetime as dt
+from pathlib import Path
+from backends import save_yaml
+
+STATUSES = ("attending", "interested", "no")
+FIRST = ("Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannes", "Ida", "Jonas",
+         "Karla", "Luis", "Mia", "Noah", "Olga", "Paul", "Rosa", "Simon", "Tilda", "Uwe")
+LAST = ("Becker", "Fischer", "Hoffmann", "Klein", "Krüger", "Meyer", "Neumann", "Richter",
+        "Schmidt", "Schulz", "Wagner", "Weber", "Wolf", "Zimmermann")
+CITIES = ("Aachen", "Berlin", "Bremen", "Dortmund", "Hamburg", "Köln", "Leipzig", "München")
+
+def generate(path, tournaments=100, days=3, participants=20, seed=0):
+    """Write `tournaments` tournaments to `path`; return the data written."""
+    rnd = random.Random(seed)
+    rid = lambda: uuid.UUID(int=rnd.getrandbits(128)).hex
+    today = dt.date.today()
+    # A large pool keeps names repeating across tournaments, like real players
+    pool = [f"{f} {l}" for f in FIRST for l in LAST]
+    data = {"tournaments": []}
+    for i in range(tournaments):
+        start = today + dt.timedelta(days=rnd.randint(-730, 365))
+        span = [start + dt.timedelta(days=d) for d in range(days)]
+        data["tournaments"].append({
+            "id": rid(),
+            "name": f"{rnd.choice(CITIES)} Open {i}",
+            "start_date": start.isoformat(),
+            "end_date": span[-1].isoformat(),
+            "location": rnd.choice(CITIES),
+            "link": "",
+            "description": "",
+            "participants": [{
+                "id": rid(),
+                "name": name,
+                "statuses": {d.isoformat(): rnd.choice(STATUSES) for d in span},
+            } for name in rnd.sample(pool, min(participants, len(pool)))],
+        })
+    save_yaml(Path(path), data)
+    return data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", default="data.yaml")
+    parser.add_argument("--tournaments", type=int, default=100)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate(args.path, args.tournaments, args.days, args.participants, args.seed)
+    print(f"{args.tournaments} Turniere nach {args.path} geschrieben.")
@@ -0,0 +1,183 @@
+"""
+Turnierverwaltung – Benchmarks
+Misst Latenz-Perzentile und Speicherspitzen der Routen (über den Flask-
+Testclient) und der Persistenz für mehrere synthetische Datengrößen und
+schreibt die Ergebnisse als JSON, damit Läufe verglichen werden können.
+
+    python -m bench.run --sizes 100x3x20,1000x3x20 --out bench_results.json
+    python -m bench.run --compare bench_results.json   (Vergleich mit altem Lauf)
+
+Größen: <Turniere>x<Tage pro Turnier>x<Teilnehmer pro Turnier>
+"""
+import argparse, json, platform, subprocess, tempfile, time, tracemalloc, uuid, datetime as dt
+from pathlib import Path
+import app as app_module
+from backends import open_backend
+from cache import LRUCache
+from tiering import ColdArchive
+from bench.generate import generate
+
+SLOWER = 1.2  # --compare flags benchmarks whose p50 grew by more than this factor
+
+def _percentile(sorted_values, q):
+    # Nearest rank on an ascending list
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def measure(name, fn, repeat, setup=None):
+    """Time `repeat` calls of fn() (after one warm-up call) and trace the
+    allocation peak of one more call. Returns a result dict in milliseconds/KiB."""
+    if setup:
+        setup()
+    fn()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        "name": name,
+        "n": repeat,
+        "p50_ms": _percentile(timings, 0.50),
+        "p90_ms": _percentile(timings, 0.90),
+        "p99_ms": _percentile(timings, 0.99),
+        "max_ms": timings[-1],
+        "peak_kib": peak / 1024,
+    }
+
+def _signup(tid):
+    return {"op": "signup", "tid": tid, "pid": uuid.uuid4().hex,
+            "name": "Bench Spieler", "statuses": {}}
+
+def bench_persistence(directory, backend, repeat):
+    def fresh():
+        return open_backend(backend, directory / "data.yaml", directory / "data.sqlite3")
+    store = app_module.DataStore(fresh())
+    store.refresh()
+    tid = store.tournaments()[0]["id"]
+    results = [
+        measure("backend load", lambda: fresh().load(), repeat),
+        measure("store cold start", lambda: app_module.DataStore(fresh()).refresh(), repeat),
+        measure("store refresh (unchanged)", store.refresh, repeat),
+        measure("apply signup", lambda: store.apply(_signup(tid)), repeat),
+        measure("compact", store.compact, repeat),
+    ]
+    # What the parsed data costs while resident
+    tracemalloc.start()
+    resident = app_module.DataStore(fresh())
+    resident.refresh()
+    results.append({"name": "store resident", "retained_kib": tracemalloc.get_traced_memory()[0] / 1024})
+    tracemalloc.stop()
+    return results
+
+def bench_routes(directory, backend, repeat):
+    # Point the app at the generated data, as the tests do
+    app_module.STORE = app_module._open_store(
+        open_backend(backend, directory / "data.yaml", directory / "data.sqlite3"))
+    app_module.FRAGMENTS = LRUCache(app_module.FRAGMENT_CACHE_SIZE)
+    app_module.VIEWS = app_module.ViewCache()
+    app_module.COLD = ColdArchive(directory / "archive")
+    app_module.app.testing = True
+    client = app_module.app.test_client()
+    upcoming, _ = app_module.STORE.split(app_module._border().isoformat())
+    tid = (upcoming or app_module.STORE.tournaments())[0]["id"]
+
+    def get(url):
+        def call():
+            resp = client.get(url)
+            assert resp.status_code == 200, (url, resp.status_code)
+            resp.get_data()  # pages are streamed
+            resp.close()
+        return call
+
+    def signup():
+        resp = client.post(f"/signup/{tid}", data={"player": "Bench Spieler"})
+        assert resp.status_code == 302, resp.status_code
+
+    return [
+        measure("GET /", get("/"), repeat),
+        measure("GET / (no fragment cache)", get("/"), repeat, setup=app_module.FRAGMENTS.clear),
+        measure("GET /archive", get("/archive"), repeat),
+        measure("GET /api/search", get("/api/search?q=open"), repeat),
+        measure("POST /signup", signup, repeat),
+    ]
+
+def run(sizes, repeat, backend):
+    runs = []
+    for spec in sizes:
+        tournaments, days, participants = (int(n) for n in spec.split("x"))
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            data = generate(directory / "data.yaml", tournaments, days, participants)
+            if backend == "sqlite":
+                open_backend("sqlite", directory / "data.yaml", directory / "data.sqlite3").replace_all(data, 0)
+            size = {"tournaments": tournaments, "days": days, "participants": participants,
+                    "data_bytes": (directory / "data.yaml").stat().st_size}
+            print(f"== {spec} ({size['data_bytes'] // 1024} KiB)", flush=True)
+            results = bench_persistence(directory, backend, repeat) + bench_routes(directory, backend, repeat)
+            for r in results:
+                if "p50_ms" in r:
+                    print(f"  {r['name']:<28} p50 {r['p50_ms']:8.2f} ms  p99 {r['p99_ms']:8.2f} ms"
+                          f"  peak {r['peak_kib']:9.1f} KiB")
+            runs.append({"size": size, "results": results})
+    return runs
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(old, new):
+    """Print the p50 change of every benchmark present in both runs."""
+    def index(report):
+        return {(json.dumps(r["size"], sort_keys=True), b["name"]): b
+                for r in report["runs"] for b in r["results"] if "p50_ms" in b}
+    before = index(old)
+    for key, b in index(new).items():
+        a = before.get(key)
+        if a is None or not a["p50_ms"]:
+            continue
+        factor = b["p50_ms"] / a["p50_ms"]
+        flag = "  <-- langsamer" if factor > SLOWER else ""
+        size = json.loads(key[0])
+        print(f"  {size['tournaments']:>6} {b['name']:<28} {a['p50_ms']:8.2f} -> {b['p50_ms']:8.2f} ms"
+              f"  x{factor:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100x3x20,1000x3x20",
+                        help="comma-separated <tournaments>x<days>x<participants>")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--backend", choices=("yaml", "sqlite"), default="yaml")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+    report = {
+        "meta": {
+            "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "repeat": args.repeat,
+        },
+        "runs": run(args.sizes.split(","), args.repeat, args.backend),
+    }
+    if args.compare:
+        print(f"== Vergleich mit {args.compare}")
+        compare(json.loads(Path(args.compare).read_text()), report)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Ergebnisse nach {args.out} geschrieben.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Turnierverwaltung – iCalendar-Feeds (RFC 5545)
+Ganztägige Termine für Kalender-Apps; die Routen in app.py cachen das
+Ergebnis pro Datenstand.
+"""
+import datetime as dt
+
+PRODID = "-//Turnierverwaltung//DE"
+
+def _escape(text):
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def _fold(line):
+    # Content lines are limited to 75 octets; longer ones continue after CRLF + space
+    raw = line.encode("utf8")
+    parts, limit = [], 75
+    while len(raw) > limit:
+        cut = limit
+        while raw[cut] & 0xC0 == 0x80:  # don't split a UTF-8 sequence
+            cut -= 1
+        parts.append(raw[:cut])
+        raw, limit = raw[cut:], 74
+    parts.append(raw)
+    return b"\r\n ".join(parts).decode("utf8")
+
+def event(uid, summary, first, last, stamp, location="", url="", description=""):
+    """Lines of one all-day VEVENT covering the dates first..last."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp.strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART;VALUE=DATE:{first.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(last + dt.timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    if url:
+        lines.append(f"URL:{url}")
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+def calendar(name, events):
+    """VCALENDAR text with CRLF line endings from event() line lists."""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+             f"X-WR-CALNAME:{_escape(name)}"]
+    for e in events:
+        lines.extend(e)
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+def runs(days, cells):
+    """(first, last, status) for each run of consecutive days with the same
+    status other than "no"."""
+    result = []
+    for day, status in zip(days, cells):
+        if status == "no":
+            continue
+        if result and result[-1][2] == status and result[-1][1] + dt.timedelta(days=1) == day:
+            result[-1] = (result[-1][0], day, status)
+        else:
+            result.append((day, day, status))
+    return result
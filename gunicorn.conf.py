@@ -0,0 +1,24 @@
+"""
+Turnierverwaltung – Gunicorn-Konfiguration für den Produktivbetrieb
+Start:  gunicorn -c gunicorn.conf.py app:app
+
+Jeder Worker hält eigene Caches; sie bleiben kohärent, weil der DataStore
+vor jedem Zugriff den gemeinsamen Stand (mtime/size bzw. SQLite-Sequenz)
+prüft und nur fremde Änderungen nachlädt.
+"""
+import multiprocessing, os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("WEB_THREADS", 4))
+# gevent (pip install gevent) holds live-update streams without a thread
+# each, see EVENTS_MAX_STREAMS in app.py
+worker_class = os.environ.get("WEB_WORKER_CLASS", "gthread")
+timeout = int(os.environ.get("WEB_TIMEOUT", 30))
+keepalive = 5
+accesslog = "-"
+
+def post_worker_init(worker):
+    # Load the data and build the indexes before the worker takes traffic
+    from app import warm
+    warm()
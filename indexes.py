@@ -0,0 +1,258 @@
+"""
+Turnierverwaltung – Suchstrukturen über den Turnierdaten
+"""
+import heapq, datetime as dt
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+class IntervalIndex:
+    """Answers "which tournaments cover this day/range" via bisect over start dates."""
+
+    def __init__(self, intervals):
+        # intervals: iterable of (start_date, end_date, tid)
+        items = sorted((s.toordinal(), e.toordinal(), tid) for s, e, tid in intervals)
+        self._starts = [s for s, _, _ in items]
+        self._items = items
+        self._spans = {tid: (s, e) for s, e, tid in items}
+        # No interval is longer than this, so earlier starts can be skipped
+        self._max_len = max((e - s for s, e, _ in items), default=0)
+
+    def overlapping(self, first, last):
+        """Ids of tournaments overlapping [first, last], ordered by start date."""
+        lo = bisect_left(self._starts, first.toordinal() - self._max_len)
+        hi = bisect_right(self._starts, last.toordinal())
+        first = first.toordinal()
+        return [tid for _, e, tid in self._items[lo:hi] if e >= first]
+
+    def covering(self, day):
+        """Ids of all tournaments taking place on `day`."""
+        return self.overlapping(day, day)
+
+    def by_day(self, first, last):
+        """{ordinal: [tid, ...]} for every day in [first, last] with a tournament."""
+        lo, hi = first.toordinal(), last.toordinal()
+        days = {}
+        for tid in self.overlapping(first, last):
+            s, e = self._spans[tid]
+            for n in range(max(s, lo), min(e, hi) + 1):
+                days.setdefault(n, []).append(tid)
+        return days
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    """Trigram index over tournament name, location and participant names.
+
+    Kept up to date per tournament via update(); search() returns the ids of
+    tournaments matching every whitespace-separated term as a substring.
+    Searches run without the store's lock, concurrently with update(): they
+    only look at whole entries (replaced in one step) and snapshots.
+    """
+
+    def __init__(self):
+        self._docs = {}   # tid -> lower-cased searchable strings
+        self._grams = {}  # trigram -> {tid, ...}
+
+    def rebuild(self, tournaments):
+        self._docs, self._grams = {}, {}
+        for t in tournaments:
+            self.update(t["id"], t)
+
+    def update(self, tid, t):
+        """(Re-)index tournament `tid`; t=None removes it."""
+        old = self._docs.get(tid, ())
+        new = () if t is None else tuple(s.lower() for s in (
+            [t["name"], t.get("location") or ""] + [p["name"] for p in t["participants"]]) if s)
+        old_grams = set().union(*map(_trigrams, old))
+        new_grams = set().union(*map(_trigrams, new))
+        for g in old_grams - new_grams:
+            posting = self._grams[g]
+            posting.discard(tid)
+            if not posting:
+                del self._grams[g]
+        for g in new_grams - old_grams:
+            self._grams.setdefault(g, set()).add(tid)
+        if t is None:
+            self._docs.pop(tid, None)
+        else:
+            self._docs[tid] = new
+
+    def search(self, query):
+        result = None
+        for term in query.lower().split():
+            ids = self._match(term)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result if result is not None else set(self._docs)
+
+    def _match(self, term):
+        docs = self._docs
+        grams = _trigrams(term)
+        if grams:
+            # set.intersection runs in C in one go; no update interleaves
+            postings = sorted((self._grams.get(g, set()) for g in grams), key=len)
+            candidates = [(tid, docs.get(tid, ())) for tid in set.intersection(*postings)]
+        else:
+            candidates = list(docs.items())  # terms shorter than three characters
+        return {tid for tid, strings in candidates if any(term in s for s in strings)}
+
+class NameIndex:
+    """Case-folded participant names, sorted for prefix search by bisect and
+    ranked by how many tournaments each name signed up for."""
+
+    def __init__(self):
+        self._keys = []     # sorted case-folded names
+        self._counts = {}   # key -> number of tournaments
+        self._display = {}  # key -> spelling to suggest
+        self._by_tid = {}   # tid -> keys of its participants
+
+    def rebuild(self, tournaments):
+        self._keys, self._counts, self._display, self._by_tid = [], {}, {}, {}
+        for t in tournaments:
+            self.update(t["id"], t)
+
+    def update(self, tid, t):
+        old = self._by_tid.pop(tid, {})
+        new = {} if t is None else {p["name"].casefold(): p["name"] for p in t["participants"]}
+        for key in old.keys() - new.keys():
+            self._counts[key] -= 1
+            if not self._counts[key]:
+                del self._counts[key], self._display[key]
+                del self._keys[bisect_left(self._keys, key)]
+        for key, name in new.items():
+            if key not in old:
+                if key not in self._counts:
+                    insort(self._keys, key)
+                    self._counts[key] = 0
+                self._counts[key] += 1
+            self._display[key] = name
+        if new:
+            self._by_tid[tid] = new
+
+    def complete(self, prefix, limit=10):
+        """Up to `limit` names starting with `prefix`, most frequent first."""
+        prefix = prefix.casefold()
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff")
+        # Read without the store's lock: a name may be forgotten meanwhile
+        counts, display = self._counts, self._display
+        best = heapq.nlargest(limit, self._keys[lo:hi], key=lambda key: counts.get(key, 0))
+        return [name for name in map(display.get, best) if name is not None]
+
+# Status codes of the attendance matrix
+STATUS_NAMES = ("no", "interested", "attending")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+INTERESTED, ATTENDING = STATUS_CODES["interested"], STATUS_CODES["attending"]
+
+def _days(t):
+    first, last = (dt.date.fromisoformat(str(t[k])) for k in ("start_date", "end_date"))
+    return tuple((first + dt.timedelta(days=i)).isoformat() for i in range((last - first).days + 1))
+
+class Attendance:
+    """Participants x days of one tournament as a byte matrix of status codes,
+    plus per-day headcounts of attending and interested players."""
+    __slots__ = ("days", "_col", "_rows", "_pids", "_refs", "cells", "attending", "interested")
+
+    def __init__(self, days):
+        self.days = days  # ISO dates, one column each
+        self._col = {day: i for i, day in enumerate(days)}
+        self._rows = {}   # pid -> row
+        self._pids = []   # row -> pid
+        self._refs = {}   # pid -> statuses dict the row was built from
+        self.cells = array("b")
+        self.attending = array("i", [0]) * len(days)
+        self.interested = array("i", [0]) * len(days)
+
+    @classmethod
+    def of(cls, t):
+        matrix = cls(_days(t))
+        matrix.sync(t["participants"])
+        return matrix
+
+    def sync(self, participants):
+        """Bring the matrix in line with `participants`; only changed rows are touched."""
+        seen = set()
+        for p in participants:
+            seen.add(p["id"])
+            # Signups replace the statuses dict, so the same dict means the same row
+            if self._refs.get(p["id"]) is not p["statuses"]:
+                self._set(p["id"], p["statuses"])
+        for pid in [pid for pid in self._pids if pid not in seen]:
+            self._remove(pid)
+
+    def statuses(self, pid):
+        """Status name per day for participant `pid`."""
+        n = len(self.days)
+        base = self._rows[pid] * n
+        return [STATUS_NAMES[code] for code in self.cells[base:base + n]]
+
+    def headcounts(self):
+        return [{"date": day, "attending": a, "interested": i}
+                for day, a, i in zip(self.days, self.attending, self.interested)]
+
+    def _count(self, row, sign):
+        n = len(self.days)
+        for col, code in enumerate(self.cells[row * n:(row + 1) * n]):
+            if code == ATTENDING:
+                self.attending[col] += sign
+            elif code == INTERESTED:
+                self.interested[col] += sign
+
+    def _set(self, pid, statuses):
+        n = len(self.days)
+        row = self._rows.get(pid)
+        if row is None:
+            row = self._rows[pid] = len(self._pids)
+            self._pids.append(pid)
+            self.cells.extend(bytes(n))
+        else:
+            self._count(row, -1)
+        codes = bytearray(n)
+        for day, status in statuses.items():
+            col = self._col.get(str(day))
+            if col is not None:
+                codes[col] = STATUS_CODES.get(status, 0)
+        self.cells[row * n:(row + 1) * n] = array("b", codes)
+        self._refs[pid] = statuses
+        self._count(row, 1)
+
+    def _remove(self, pid):
+        # Move the last row into the gap
+        n = len(self.days)
+        row = self._rows.pop(pid)
+        del self._refs[pid]
+        self._count(row, -1)
+        last = len(self._pids) - 1
+        if row != last:
+            moved = self._pids[last]
+            self.cells[row * n:(row + 1) * n] = self.cells[last * n:(last + 1) * n]
+            self._pids[row] = moved
+            self._rows[moved] = row
+        self._pids.pop()
+        del self.cells[last * n:]
+
+class AttendanceIndex:
+    """Attendance matrix per tournament id, following every change."""
+
+    def __init__(self):
+        self._by_tid = {}
+
+    def rebuild(self, tournaments):
+        self._by_tid = {}
+        for t in tournaments:
+            self.update(t["id"], t)
+
+    def update(self, tid, t):
+        if t is None:
+            self._by_tid.pop(tid, None)
+            return
+        matrix = self._by_tid.get(tid)
+        days = _days(t)
+        if matrix is None or matrix.days != days:
+            matrix = self._by_tid[tid] = Attendance(days)
+        matrix.sync(t["participants"])
+
+    def get(self, tid):
+        return self._by_tid.get(tid)
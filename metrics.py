@@ -0,0 +1,109 @@
+"""
+Turnierverwaltung – Laufzeitmetriken im Prometheus-Textformat
+Zähler und Histogramme leben pro Prozess; jeder Worker meldet seine eigenen.
+"""
+import threading, time
+from contextlib import contextmanager
+
+# Seconds; upper bounds of the histogram buckets (+Inf is implicit)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, _labels(self.labelnames, key), value
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=BUCKETS):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        for key, counts in items:
+            names = self.labelnames + ("le",)
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                yield self.name + "_bucket", _labels(names, key + (bound,)), count
+            yield self.name + "_count", _labels(self.labelnames, key), counts[-2]
+            yield self.name + "_sum", _labels(self.labelnames, key), counts[-1]
+
+def render(metrics, gauges=()):
+    """Prometheus text exposition of `metrics` plus gauges read at scrape
+    time, given as (name, doc, labelnames, {label values: value})."""
+    lines = []
+    for m in metrics:
+        lines.append(f"# HELP {m.name} {m.doc}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(f"{name}{labels} {_number(value)}" for name, labels, value in m.samples())
+    for name, doc, labelnames, values in gauges:
+        lines.append(f"# HELP {name} {doc}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(f"{name}{_labels(labelnames, key)} {_number(value)}"
+                     for key, value in values.items())
+    return "\n".join(lines) + "\n"
+
+# ---------- Metrics ----------
+REQUESTS = Counter("http_requests_total", "HTTP requests by route, method and status.",
+                   ("route", "method", "status"))
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request latency by route.",
+                            ("route", "method"))
+PERSISTENCE_SECONDS = Histogram("persistence_duration_seconds",
+                                "Time spent reading and writing the data files.", ("operation",))
+RENDER_SECONDS = Histogram("render_duration_seconds",
+                           "Time spent building pages: calendar, cards and templates.", ("part",))
+TENANT_EVENTS = Counter("tenant_events_total", "Tenants loaded into and evicted from memory.",
+                        ("event",))
+PROFILES_SKIPPED = Counter("profiles_skipped_total",
+                           "Requests left unprofiled because another one was being profiled.")
+ALL = (REQUESTS, REQUEST_SECONDS, PERSISTENCE_SECONDS, RENDER_SECONDS, TENANT_EVENTS,
+       PROFILES_SKIPPED)
@@ -0,0 +1,145 @@
+document.addEventListener('DOMContentLoaded', () => {
+  document.body.addEventListener('click', e => {
+    // Toggle tournament edit form
+    const toggle = e.target.closest('.edit-tour-toggle');
+    if (toggle) {
+      const btn = toggle;
+      const card = btn.closest('.card');
+      const container = card.querySelector('.edit-tour-container');
+      if (container) container.classList.toggle('active');
+      return;
+    }
+    // Create toggle
+    if (e.target.classList.contains('create-toggle')) {
+      e.target.nextElementSibling.classList.toggle('active');
+      return;
+    }
+    // Edit participant: prefill signup form
+    const pbtn = e.target.closest('.edit-btn');
+    if (pbtn) {
+      const btn = pbtn;
+      const card = btn.closest('.card');
+      const form = card.querySelector('form[action*="signup"]');
+      const statuses = JSON.parse(btn.getAttribute('data-statuses'));
+      // Prefill name
+      form.querySelector('input[name="player"]').value = btn.getAttribute('data-name');
+      // Prefill statuses
+      Object.entries(statuses).forEach(([date, stat]) => {
+        const sel = form.querySelector('select[name="status_' + date + '"]');
+        if (sel) sel.value = stat;
+      });
+      form.scrollIntoView({ behavior: 'smooth' });
+      return;
+    }
+  });
+  // Name suggestions: fetched per prefix instead of shipping every name
+  const names = document.getElementById('player_names');
+  let pending;
+  document.body.addEventListener('input', e => {
+    if (e.target.name !== 'player') return;
+    clearTimeout(pending);
+    const prefix = e.target.value.trim();
+    if (!prefix) return;
+    pending = setTimeout(() => {
+      fetch(names.dataset.src + '?prefix=' + encodeURIComponent(prefix))
+        .then(r => r.json())
+        .then(list => names.replaceChildren(...list.map(name => {
+          const option = document.createElement('option');
+          option.value = name;
+          return option;
+        })));
+    }, 150);
+  });
+  // Archive: fetch the next page once its placeholder scrolls into view
+  if ('IntersectionObserver' in window) {
+    const observer = new IntersectionObserver(entries => {
+      entries.forEach(entry => {
+        if (!entry.isIntersecting) return;
+        const more = entry.target;
+        observer.unobserve(more);
+        fetch(more.dataset.partial)
+          .then(r => r.text())
+          .then(html => {
+            const grid = more.parentNode;
+            more.insertAdjacentHTML('afterend', html);
+            more.remove();
+            const next = grid.querySelector('.archive-more');
+            if (next) observer.observe(next);
+          });
+      });
+    }, { rootMargin: '400px' });
+    const more = document.querySelector('.archive-more');
+    if (more) observer.observe(more);
+  }
+  // Live updates: forms are sent via fetch, changed rows are patched in place
+  const patchRow = (tid, pid, html) => {
+    const card = document.getElementById('tournament-' + tid);
+    if (!card) return;
+    const tbody = card.querySelector('.status-table tbody');
+    const old = tbody.querySelector('tr[data-pid="' + pid + '"]');
+    if (!html) { if (old) old.remove(); return; }
+    const tpl = document.createElement('template');
+    tpl.innerHTML = html.trim();
+    const row = tpl.content.firstElementChild;
+    if (old) { old.replaceWith(row); return; }
+    const next = [...tbody.rows].find(r => r.dataset.name > row.dataset.name);
+    tbody.insertBefore(row, next || null);
+  };
+  const patchCounts = (tid, counts) => {
+    const card = document.getElementById('tournament-' + tid);
+    if (!card || !counts) return;
+    counts.forEach(c => {
+      const cell = card.querySelector('th[data-iso="' + c.date + '"] .headcount');
+      if (cell) cell.textContent = '✓ ' + c.attending + ' · ? ' + c.interested;
+    });
+  };
+  const patchCard = (tid, html) => {
+    const card = document.getElementById('tournament-' + tid);
+    if (card) card.outerHTML = html;
+  };
+  document.body.addEventListener('submit', e => {
+    const form = e.target;
+    const action = form.getAttribute('action') || '';
+    if (!/[/](signup|edit_tournament)[/]/.test(action) || !window.fetch) return;
+    e.preventDefault();
+    fetch(action, { method: 'POST', body: new FormData(form), headers: { 'Accept': 'application/json' } })
+      .then(r => r.json().then(body => ({ ok: r.ok, body })))
+      .then(({ ok, body }) => {
+        if (!ok) { alert(body.error); return; }
+        if (body.pid) { patchRow(body.tid, body.pid, body.html); patchCounts(body.tid, body.headcounts); form.reset(); }
+        else patchCard(body.tid, body.html);
+      })
+      .catch(() => form.submit());
+  });
+  const banner = document.getElementById('live-banner');
+  // Live updates: pushed over Server-Sent Events. If the server has no stream
+  // left (503), poll the change feed instead; unchanged polls end in a 304
+  const handlers = {
+    'row': d => { patchRow(d.tid, d.pid, d.html); patchCounts(d.tid, d.headcounts); },
+    'row-removed': d => { patchRow(d.tid, d.pid, null); patchCounts(d.tid, d.headcounts); },
+    'card': d => patchCard(d.tid, d.html),
+    'changed': () => { banner.hidden = false; },
+  };
+  let since = null;
+  const poll = () => {
+    const url = new URL(banner.dataset.poll, location.href);
+    if (since !== null) url.searchParams.set('since', since);
+    fetch(url, {headers: {'Accept': 'application/json'}})
+      .then(r => r.ok ? r.json() : Promise.reject(r.status))
+      .then(body => {
+        body.events.forEach(e => handlers[e.event](e.data));
+        since = body.seq;
+      })
+      .catch(() => {})
+      .finally(() => setTimeout(tick, banner.dataset.interval * 1000));
+  };
+  const tick = () => document.hidden ? setTimeout(tick, banner.dataset.interval * 1000) : poll();
+  if (!window.EventSource) { poll(); return; }
+  const events = new EventSource(banner.dataset.src);
+  Object.entries(handlers).forEach(([name, handler]) => events.addEventListener(name, e => {
+    handler(JSON.parse(e.data));
+    since = Number(e.lastEventId);
+  }));
+  // A closed stream is not retried by the browser: turned away or gone
+  events.addEventListener('error', () => { if (events.readyState === EventSource.CLOSED) poll(); });
+});
@@ -0,0 +1,332 @@
+"""
+Turnierverwaltung – residenter Datenspeicher
+Hält die Daten geparst im Speicher, lädt nur bei Änderung neu und führt
+Hash-Indizes über Turniere und Teilnehmer. Die Persistenz übernimmt ein
+Backend aus backends.py (YAML mit Journal oder SQLite).
+"""
+import threading, time
+from collections import deque
+from indexes import SearchIndex
+
+FEED_SIZE = 1024          # recent changes kept for live subscribers
+FEED_POLL_SECONDS = 1.0   # how often waiting subscribers look for other workers' writes
+
+# ---------- Operations ----------
+# Every mutation is a small dict ({"op": ..., ...}). Ids are generated by the
+# caller, so replaying an op always yields the same result.
+def apply_op(data, op, by_id, by_pid, by_name):
+    """Apply one operation to `data` in place, keeping the hash indexes (see
+    DataStore) current; return the affected tournament id, None if the
+    operation changes nothing (unknown tournament or participant)."""
+    kind = op["op"]
+    if kind == "create":
+        t = op["tournament"]
+        if t["id"] in by_id:
+            return None
+        data["tournaments"] = data["tournaments"] + [t]
+        by_id[t["id"]] = t
+        for p in t["participants"]:
+            _index_participant(t, p, by_pid, by_name)
+        return t["id"]
+    t = by_id.get(op["tid"])
+    if t is None:
+        return None
+    if kind == "signup":
+        p = by_name.get(op["name"].lower(), {}).get(t["id"])
+        if p is not None:
+            p["statuses"] = op["statuses"]
+        else:
+            p = {"id": op["pid"], "name": op["name"], "statuses": op["statuses"]}
+            t["participants"] = t["participants"] + [p]
+            _index_participant(t, p, by_pid, by_name)
+    elif kind == "edit":
+        t["link"] = op["link"]
+        t["description"] = op["description"]
+    elif kind == "delete_tournament":
+        data["tournaments"] = [x for x in data["tournaments"] if x["id"] != t["id"]]
+        del by_id[t["id"]]
+        for p in t["participants"]:
+            _unindex_participant(t, p, by_pid, by_name)
+    elif kind == "delete_participant":
+        owner, p = by_pid.get(op["pid"], (None, None))
+        if owner is not t:
+            return None
+        t["participants"] = [x for x in t["participants"] if x is not p]
+        _unindex_participant(t, p, by_pid, by_name)
+    else:
+        raise ValueError(f"unknown operation: {kind}")
+    return t["id"]
+
+def _index_participant(t, p, by_pid, by_name):
+    by_pid[p["id"]] = (t, p)
+    by_name.setdefault(p["name"].lower(), {})[t["id"]] = p
+
+def _unindex_participant(t, p, by_pid, by_name):
+    by_pid.pop(p["id"], None)
+    key = p["name"].lower()
+    byt = by_name.get(key)
+    if byt is not None:
+        byt.pop(t["id"], None)
+        if not byt:
+            del by_name[key]
+
+# ---------- Store ----------
+class DataStore:
+    def __init__(self, backend, commit_window=0.0, commit_max_ops=64):
+        self.backend = backend
+        # Group commit: submit() collects ops for up to `commit_window` seconds
+        # or `commit_max_ops` ops and persists them with one apply()
+        self.commit_window = commit_window
+        self.commit_max_ops = commit_max_ops
+        self._queue = []   # [ops, done event, error]
+        self._queued_ops = 0
+        self._leader = False
+        self._queue_cond = threading.Condition()
+        self.data = {"tournaments": []}
+        self.seq = 0       # sequence number of the last applied change
+        self.by_id = {}    # tid -> tournament
+        self.by_pid = {}   # pid -> (tournament, participant)
+        self.by_name = {}  # lower-cased name -> {tid: participant}
+        self.versions = {} # tid -> counter, changes whenever the tournament does
+        self.tick = 0      # bumped on every change, in-process only
+        self._derived = {}
+        # (tick, seq, op) of recent changes; op None marks a full reload
+        self.feed = deque(maxlen=FEED_SIZE)
+        # Secondary indexes, kept current on every change: rebuild()/update()
+        self.indexes = {"search": SearchIndex()}
+        self._stamp = None
+        self._loaded = False
+        self._compacting = False
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+
+    def refresh(self):
+        """Catch up with changes from other workers; return True if anything changed."""
+        if self._loaded and self.backend.stamp() == self._stamp:
+            return False
+        with self._lock, self.backend.lock(exclusive=False):
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        stamp = self.backend.stamp()
+        if self._loaded and stamp == self._stamp:
+            return False
+        records = self.backend.changes(self.seq) if self._loaded else None
+        if records is None:
+            previous = self.by_id if self.tick else None  # None: the first load
+            self.data, self.seq = self.backend.load()
+            self._reindex(previous)
+            records = self.backend.changes(self.seq)
+        for seq, op in records:
+            if seq > self.seq:
+                self._apply_one(op, seq)
+                self.seq = seq
+        self._stamp = stamp
+        self._loaded = True
+        self._changed.notify_all()
+        return True
+
+    def _reindex(self, previous=None):
+        """Index freshly loaded data. Tournaments equal to their `previous`
+        copy keep their versions (and so their cached views and cards); the
+        feed only gets a reload marker if anything differs. Another worker's
+        compaction thus costs subscribers nothing."""
+        self.by_id, self.by_pid, self.by_name = {}, {}, {}
+        for t in self.data["tournaments"]:
+            self.by_id[t["id"]] = t
+            for p in t["participants"]:
+                _index_participant(t, p, self.by_pid, self.by_name)
+        self.tick += 1
+        old_versions = self.versions
+        self.versions = {tid: old_versions[tid]
+                         if previous is not None and previous.get(tid) == t else self.tick
+                         for tid, t in self.by_id.items()}
+        if (previous is None or previous.keys() != self.by_id.keys()
+                or any(v == self.tick for v in self.versions.values())):
+            self.feed.append((self.tick, self.seq, None))
+        for ix in self.indexes.values():
+            ix.rebuild(self.data["tournaments"])
+
+    def _apply_one(self, op, seq):
+        """Apply `op` as change `seq`; False if it changes nothing."""
+        tid = apply_op(self.data, op, self.by_id, self.by_pid, self.by_name)
+        if tid is None:
+            return False
+        t = self.by_id.get(tid)
+        self.tick += 1
+        self.feed.append((self.tick, seq, op))
+        if t is not None:
+            self.versions[tid] = self.tick
+        else:
+            self.versions.pop(tid, None)
+        for ix in self.indexes.values():
+            ix.update(tid, t)
+        return True
+
+    def add_index(self, name, ix):
+        """Register a secondary index; it is kept current from now on."""
+        with self._lock:
+            self.indexes[name] = ix
+            if self._loaded:
+                ix.rebuild(self.data["tournaments"])
+
+    # ----- Reads -----
+    def version(self):
+        """Data version shared by all workers: the sequence number (bumped on
+        every write) plus the backend stamp, which also catches hand edits.
+        Only stats the backend unless something changed."""
+        self.refresh()
+        return f"{self.seq}:{self._stamp!r}"
+
+    def derived(self, name, build):
+        """build(tournaments), cached until the data changes."""
+        self.refresh()
+        tick, value = self._derived.get(name, (None, None))
+        if tick != self.tick:
+            tick = self.tick
+            value = build(self.data["tournaments"])
+            self._derived[name] = (tick, value)
+        return value
+
+    def wait_changes(self, tick, timeout):
+        """Feed entries newer than `tick`, waiting up to `timeout` seconds for
+        one. Other workers' writes are only seen by refresh(), so the wait is
+        cut into polls. [(tick, seq, None)] means entries were missed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.refresh()
+            with self._lock:
+                if self.feed and self.feed[0][0] > tick + 1:
+                    return [(self.tick, self.seq, None)]
+                new = [entry for entry in self.feed if entry[0] > tick]
+                remaining = deadline - time.monotonic()
+                if new or remaining <= 0:
+                    return new
+                self._changed.wait(min(remaining, FEED_POLL_SECONDS))
+
+    def feed_tick(self, seq):
+        """Tick to follow the feed from, right after change `seq` (None: from
+        now on); None if that change is no longer in the feed. A full reload
+        at `seq` counts too: nothing was missed up to there."""
+        self.refresh()
+        with self._lock:
+            if seq is None or seq == self.seq:
+                return self.tick
+            for tick, entry_seq, _ in reversed(self.feed):
+                if entry_seq == seq:
+                    return tick
+            return None
+
+    def reading(self):
+        """Hold off changes while derived data is built from several indexes
+        (`with store.reading(): ...`); single lookups need no lock."""
+        return self._lock
+
+    def tournaments(self):
+        self.refresh()
+        return self.data["tournaments"]
+
+    def get(self, tid):
+        self.refresh()
+        return self.by_id.get(tid)
+
+    def participant(self, tid, name):
+        self.refresh()
+        return self.by_name.get(name.lower(), {}).get(tid)
+
+    def split(self, border):
+        """(upcoming, archive): tournaments ending on/after resp. before ISO date `border`."""
+        self.refresh()
+        query = getattr(self.backend, "tournament_ids", None)
+        if query is None:
+            upcoming, archive = [], []
+            for t in self.data["tournaments"]:
+                (upcoming if str(t["end_date"]) >= border else archive).append(t)
+            return upcoming, archive
+        return ([self.by_id[i] for i in query(since=border) if i in self.by_id],
+                [self.by_id[i] for i in query(until=border) if i in self.by_id])
+
+    def search(self, query):
+        """Ids of tournaments where every term of `query` occurs in the name,
+        the location or a participant name."""
+        self.refresh()
+        return self.indexes["search"].search(query)
+
+    # ----- Writes -----
+    def apply(self, *ops):
+        """Apply operations and hand them to the backend in one durable write."""
+        self.apply_with(lambda tournaments: ops)
+
+    def apply_with(self, build):
+        """Like apply(), with the ops returned by build(tournaments), which
+        runs under the same cross-process lock: nobody writes in between.
+        Ops that change nothing (e.g. on a tournament deleted meanwhile) get no
+        sequence number and are not persisted. Returns the applied ops."""
+        with self._lock, self.backend.lock():
+            self._refresh_locked()
+            ops = build(self.data["tournaments"])
+            records = []
+            try:
+                for op in ops:
+                    if self._apply_one(op, self.seq + 1):
+                        self.seq += 1
+                        records.append((self.seq, op))
+                if not records:
+                    return []
+                self.backend.append(records)
+            except BaseException:
+                # The resident data is ahead of the files now: reload on next access
+                self._loaded = False
+                self._derived = {}
+                raise
+            self._stamp = self.backend.stamp()
+            self._changed.notify_all()
+        if self.backend.needs_compaction() and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self.compact, daemon=True).start()
+        return [op for _, op in records]
+
+    def submit(self, *ops):
+        """Like apply(), but coalesced with concurrent submissions into one
+        durable write. Returns once this caller's ops are persisted."""
+        entry = [ops, threading.Event(), None]
+        with self._queue_cond:
+            self._queue.append(entry)
+            self._queued_ops += len(ops)
+            leader = not self._leader
+            if leader:
+                self._leader = True
+            elif self._queued_ops >= self.commit_max_ops:
+                self._queue_cond.notify_all()
+        if leader:
+            self._lead_commit()
+        entry[1].wait()
+        if entry[2] is not None:
+            raise entry[2]
+
+    def _lead_commit(self):
+        deadline = time.monotonic() + self.commit_window
+        with self._queue_cond:
+            while self._queued_ops < self.commit_max_ops:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._queue_cond.wait(remaining)
+            batch, self._queue, self._queued_ops = self._queue, [], 0
+            self._leader = False  # the next arrival leads the next batch
+        try:
+            self.apply(*[op for ops, _, _ in batch for op in ops])
+        except BaseException as e:
+            for entry in batch:
+                entry[2] = e
+        for entry in batch:
+            entry[1].set()
+
+    def compact(self):
+        try:
+            with self._lock, self.backend.lock():
+                self._refresh_locked()
+                self.backend.compact(self.data, self.seq)
+                self._stamp = self.backend.stamp()
+        finally:
+            self._compacting = False
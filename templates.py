@@ -0,0 +1,272 @@
+"""
+Turnierverwaltung – Seiten-Templates
+Werden beim Start einmal kompiliert (siehe app.py, DictLoader).
+"""
+
+LOGIN_TPL = """
+<form method="post">
+  <label>Admin-Passwort</label>
+  <input name="password" type="password">
+  <button type="submit">Login</button>
+</form>
+"""
+
+ADMIN_TPL = """
+<!doctype html><html lang="de"><head><meta charset="utf-8">
+<title>Admin-Panel</title><style>
+  :root{--accent:#c00000;}
+  body{font-family:system-ui,sans-serif;padding:1rem;}
+  .btn-primary{background:var(--accent);color:#fff;padding:.5rem 1rem;border:none;border-radius:.5rem;}
+  .flash{background:#fff3cd;padding:.5rem 1rem;border-radius:.5rem;}
+  .admin-filter, .admin-purge{display:flex;flex-wrap:wrap;gap:.5rem;align-items:end;margin:1rem 0;}
+  .admin-filter label, .admin-purge label{display:flex;flex-direction:column;font-size:.85rem;}
+  .participants label{display:inline-block;margin:.25rem .75rem .25rem 0;}
+  .pager{display:flex;gap:1rem;margin:1rem 0;}
+</style></head><body>
+<h1>Admin-Panel</h1>
+<p><a href="{{ url_for('index') }}">Zurück</a> | 
+   <a href="{{ url_for('admin_logout') }}">Logout</a></p>
+{% for message in get_flashed_messages() %}<p class="flash">{{ message }}</p>{% endfor %}
+
+<form class="admin-filter" method="get" action="{{ url_for('admin') }}">
+  <label>Suche <input name="q" value="{{ q }}" placeholder="Turnier, Ort oder Teilnehmer"></label>
+  <label>Von <input type="date" name="from" value="{{ first }}"></label>
+  <label>Bis <input type="date" name="until" value="{{ last }}"></label>
+  <button class="btn-primary" type="submit">Filtern</button>
+</form>
+
+<form class="admin-purge" method="post" action="{{ url_for('admin_purge') }}"
+      onsubmit="return confirm('Alle Turniere, die vor diesem Datum endeten, endgültig löschen?');">
+  <label>Alles löschen, was endete vor <input type="date" name="before" required></label>
+  <button class="btn-primary" type="submit">Bereinigen</button>
+</form>
+
+<p>{{ total }} Turnier{% if total != 1 %}e{% endif %}, Seite {{ page }} von {{ pages }}</p>
+<form method="post" action="{{ url_for('admin_bulk_delete') }}"
+      onsubmit="return confirm('Ausgewählte Einträge löschen?');">
+  <input type="hidden" name="next" value="{{ request.script_root ~ request.full_path }}">
+  {% for t in tournaments %}
+  <fieldset style="margin:1rem 0;padding:1rem;border:1px solid #ddd;">
+    <legend>
+      <label><input type="checkbox" name="tournament" value="{{ t.id }}"> {{ t.name }}</label>
+      <small>{{ t.start_fmt }}{% if t.end_date != t.start_date %} – {{ t.end_fmt }}{% endif %}{% if t.location %} · {{ t.location }}{% endif %}</small>
+    </legend>
+    <div class="participants">
+    {% for p in t.participants %}
+      <label><input type="checkbox" name="participant" value="{{ t.id }}:{{ p.id }}"> {{ p.name }}</label>
+    {% else %}
+      <small>Keine Teilnehmer</small>
+    {% endfor %}
+    </div>
+  </fieldset>
+  {% endfor %}
+  {% if tournaments %}<button class="btn-primary" type="submit">Ausgewählte löschen</button>{% endif %}
+</form>
+<div class="pager">
+  {% if page > 1 %}<a href="{{ url_for('admin', q=q, page=page - 1, **dates) }}">« Neuere</a>{% endif %}
+  {% if page < pages %}<a href="{{ url_for('admin', q=q, page=page + 1, **dates) }}">Ältere »</a>{% endif %}
+</div>
+</body></html>
+"""
+
+# One tournament card; rendered separately so it can be cached per tournament
+CARD_TPL = """
+<div class="card" id="tournament-{{ t.id }}">
+  <div class="card-header">
+    <div>
+      <h2>{{ t.name }}</h2>
+      <small>
+        {{ t.start_fmt }}{% if t.end_date and t.end_date!=t.start_date %} – {{ t.end_fmt }}{% endif %}
+        {% if t.location %} · {{ t.location }}{% endif %}
+      </small>
+    </div>
+    {% if not t.cold %}
+    <svg class="edit-tour-toggle" width="20" height="20"><use href="{{ asset_url('icons.svg') }}#edit"/></svg>
+    {% endif %}
+  </div>
+  <div class="detail-container">
+    {% if t.link %}
+      <small><a href="{{ t.link }}" target="_blank">{{ t.link }}</a></small>
+    {% endif %}
+    {% if t.description %}
+      <small style="white-space: pre-wrap; display: block;">{{ t.description }}</small>
+    {% endif %}
+  </div>
+  {% if not t.cold %}
+  <div class="edit-tour-container">
+    <form method="post" action="{{ url_for('edit_tournament', tid=t.id) }}">
+      <label class="form-label">Link</label>
+      <input name="link" value="{{ t.link or '' }}">
+      <label class="form-label">Beschreibung</label>
+      <textarea name="description" rows="2">{{ t.description or '' }}</textarea>
+      <button class="btn-primary" type="submit">Speichern</button>
+    </form>
+  </div>
+  {% endif %}
+  <div class="card-body">
+    <div class="card-left">
+      <table class="status-table">
+        <thead><tr><th>Teilnehmer</th>{% for d in t.dates %}<th data-iso="{{ d.iso }}">{{ d.fmt }}<br><small class="headcount" title="Angemeldet · Interesse">✓ {{ d.attending }} · ? {{ d.interested }}</small></th>{% endfor %}{% if not t.cold %}<th>Aktion</th>{% endif %}</tr></thead>
+        <tbody>
+          {% for p in t.participants %}{% include "status_row.html" %}{% endfor %}
+        </tbody>
+      </table>
+    </div>
+    {% if not t.cold %}
+    <div class="card-right">
+      <form method="post" action="{{ url_for('signup', tid=t.id) }}">
+        <div class="form-group">
+          <input type="text" name="player" list="player_names" placeholder="Max Mustermann" required>
+        </div>
+        {% for d in t.dates %}
+        <div class="status-field">
+          <label class="form-label" for="select_{{ d.iso }}">{{ d.fmt }}</label>
+          <select name="status_{{ d.iso }}" id="select_{{ d.iso }}">
+            <option value="attending">Angemeldet</option>
+            <option value="interested">Interesse</option>
+            <option value="no">keine Teilnahme</option>
+          </select>
+        </div>
+        {% endfor %}
+        <button class="btn-primary" type="submit">Absenden</button>
+      </form>
+    </div>
+    {% endif %}
+  </div>
+</div>
+"""
+
+# One participant row of the status table; also sent alone for live updates
+ROW_TPL = """
+<tr data-pid="{{ p.id }}" data-name="{{ p.name|lower }}">
+  <td>{{ p.name }}</td>
+  {% for stat in p.cells %}
+    <td class="status-{{ stat }}">{% if stat=='attending' %}✓{% elif stat=='interested' %}?{% else %}×{% endif %}</td>
+  {% endfor %}
+  {% if not t.cold %}
+  <td>
+    <svg class="edit-btn" width="20" height="20" title="Bearbeiten"
+       data-name="{{ p.name }}"
+       data-statuses='{{ p.statuses_json }}'><use href="{{ asset_url('icons.svg') }}#edit"/></svg>
+  </td>
+  {% endif %}
+</tr>
+"""
+
+# One archive page: cards grouped by year plus the placeholder for the next page
+ARCHIVE_PAGE_TPL = """
+{% for year, card in entries %}
+  {% if year %}<h2 class="archive-year">{{ year }}</h2>{% endif %}
+  {{ card }}
+{% endfor %}
+{% if next_url %}
+  <div class="archive-more" data-partial="{{ next_partial_url }}">
+    <a href="{{ next_url }}">Ältere Turniere laden</a>
+  </div>
+{% endif %}
+"""
+
+# The page is streamed (see _render_page in app.py): head with calendar,
+# then the cards one by one, then the foot
+PAGE_HEAD_TPL = """
+    <!doctype html><html lang="de"><head>
+    <meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+    <title>Turnierverwaltung</title>
+
+    <link rel="stylesheet" href="{{ asset_url('app.css') }}">
+    </head><body>
+    <header>
+      <img src="https://beta.aixtraball.de/static/images/logo.png" class="logo" alt="Logo">
+      <h1 class="headline">Turnierverwaltung</h1>
+    </header>
+    <nav class="tabs">
+      <a href="{{ url_for('index') }}" class="{% if not archive %}active{% endif %}">Übersicht</a>
+      <a href="{{ url_for('archive') }}" class="{% if archive %}active{% endif %}">Archiv</a>
+    </nav>
+    <form method="post" action="{{ url_for('set_filter') }}" style="margin-bottom:1rem;">
+  <input type="text" name="filter" placeholder="Nach Teilnehmer, Event oder Location filtern"
+         value="{{ filter_name }}"
+         style="padding:.5rem;border:1px solid #ddd;border-radius:.5rem;width:200px;">
+  <button class="btn-primary" type="submit">Anwenden</button>
+  {% if filter_name %}
+    <button class="btn-primary" type="submit" name="clear" value="1">Löschen</button>
+  {% endif %}
+</form>
+    <p class="ics-links">
+      <a href="{{ url_for('calendar_feed') }}">Kalender abonnieren</a>
+      {% if filter_name %} · <a href="{{ url_for('participant_feed', participant=filter_name) }}">Termine von {{ filter_name }}</a>{% endif %}
+    </p>
+    <div class="cal-wrapper">
+      {% for m in calendar_months %}
+      <div class="cal">
+        <div class="cal-header">{{ m.name }}</div>
+        <div class="cal-grid">
+          {% for day in ['Mo','Tu','We','Th','Fr','Sa','Su'] %}
+            <div class="cal-cell cal-day">{{ day }}</div>
+          {% endfor %}
+          {% for wk in m.weeks %}
+            {% for c in wk %}
+              {% if c.day %}
+                {% if c.active %}
+                  <a href="#tournament-{{ c.tids[0] }}" class="cal-cell active" title="{{ c.names|join(', ') }}">{{ c.day }}{% if c.tids|length > 1 %}<sup class="cal-count">{{ c.tids|length }}</sup>{% endif %}</a>
+                {% else %}
+                  <div class="cal-cell">{{ c.day }}</div>
+                {% endif %}
+              {% else %}
+                <div class="cal-cell">&nbsp;</div>
+              {% endif %}
+            {% endfor %}
+          {% endfor %}
+        </div>
+      </div>
+      {% endfor %}
+    </div>
+    <datalist id="player_names" data-src="{{ url_for('api_names') }}"></datalist>
+    <div class="live-banner" id="live-banner" data-src="{{ url_for('events') }}"
+         data-poll="{{ url_for('events_poll') }}" data-interval="{{ events_poll_seconds }}" hidden>
+      Es gibt neue Änderungen – <a href="">neu laden</a>
+    </div>
+
+    {% if not archive %}
+    <div class="card">
+      <button type="button" class="btn-primary create-toggle">Neues Turnier anlegen</button>
+      <div class="create-container">
+        <h2>Neues Turnier anlegen</h2>
+        <form method="post" action="{{ url_for('create') }}">
+          <label class="form-label">Name</label>
+          <input name="name" placeholder="Turniername" required>
+          <label class="form-label">Startdatum</label>
+          <input type="date" name="start_date" required>
+          <label class="form-label">Enddatum <small>(optional)</small></label>
+          <input type="date" name="end_date">
+          <label class="form-label">Ort <small>(optional)</small></label>
+          <input name="location" placeholder="Ort">
+          <label class="form-label">Link <small>(optional)</small></label>
+          <input name="link" placeholder="https://example.com">
+          <label class="form-label">Beschreibung <small>(optional)</small></label>
+          <textarea name="description" rows="3"></textarea>
+          <button class="btn-primary" type="submit">Speichern</button>
+        </form>
+      </div>
+    </div>
+    {% endif %}
+
+    <div class="grid">
+"""
+
+PAGE_FOOT_TPL = """
+    </div>
+
+    <script src="{{ asset_url('app.js') }}" defer></script>
+    </body></html>
+"""
+
+TEMPLATES = {
+    "login.html": LOGIN_TPL,
+    "admin.html": ADMIN_TPL,
+    "card.html": CARD_TPL,
+    "status_row.html": ROW_TPL,
+    "archive_page.html": ARCHIVE_PAGE_TPL,
+    "page_head.html": PAGE_HEAD_TPL,
+    "page_foot.html": PAGE_FOOT_TPL,
+}
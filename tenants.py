@@ -0,0 +1,148 @@
+"""
+Turnierverwaltung – Mandanten
+Eine Installation für mehrere Vereine: jeder Mandant hat eigene Datendateien,
+ein eigenes Admin-Passwort und eigene Caches. Gewählt wird er über den
+Hostnamen oder das erste Pfadsegment (/<mandant>/...). Geladene Mandanten
+liegen in einem LRU mit Speicherbudget; ungenutzte werden verdrängt und beim
+nächsten Zugriff neu geladen.
+
+tenants.yaml:
+
+    default: tc-nord            # optional: Mandant ohne Host/Präfix
+    tenants:
+      tc-nord:
+        dir: clubs/tc-nord      # data.yaml, data.sqlite3, archive/
+        admin_password: ...
+        hosts: [turniere.tc-nord.de]
+"""
+import os, threading, time, yaml
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from metrics import TENANT_EVENTS
+
+ENVIRON_KEY = "turnierverwaltung.tenant"
+DATA_EXPANSION = 8       # parsed data takes about this many times its file size
+CHECK_SECONDS = 5.0      # how often get() re-checks the memory budget
+
+@dataclass(frozen=True)
+class TenantConfig:
+    name: str
+    data_file: Path
+    sqlite_file: Path
+    cold_dir: Path
+    admin_password: str
+    hosts: tuple = ()
+
+def load_config(path):
+    """([TenantConfig], default tenant name or None) from a tenants.yaml."""
+    with open(path, encoding="utf8") as f:
+        raw = yaml.safe_load(f) or {}
+    configs = []
+    for name, entry in (raw.get("tenants") or {}).items():
+        name = str(name)
+        if "/" in name or not entry or not entry.get("admin_password"):
+            raise ValueError(f"tenant {name!r}: needs a name without '/' and an admin_password")
+        directory = Path(path).parent / entry.get("dir", name)
+        configs.append(TenantConfig(name, directory / "data.yaml", directory / "data.sqlite3",
+                                    directory / "archive", str(entry["admin_password"]),
+                                    tuple(h.lower() for h in entry.get("hosts", ()))))
+    default = raw.get("default")
+    if default is not None and default not in {c.name for c in configs}:
+        raise ValueError(f"unknown default tenant: {default}")
+    return configs, default
+
+@dataclass(eq=False)
+class Tenant:
+    """Everything the app keeps in memory for one tenant."""
+    config: object
+    store: object
+    fragments: object   # LRUCache of rendered cards
+    views: object       # ViewCache
+    feeds: object       # LRUCache of iCalendar feeds
+    cold: object        # ColdArchive
+
+    @property
+    def name(self):
+        return self.config.name
+
+    def memory(self):
+        """Rough resident size in bytes: the parsed data (estimated from the
+        file sizes) plus the cached HTML and feeds."""
+        size = 0
+        if self.store.tick:  # loaded
+            backend = self.store.backend
+            for p in (backend.path, getattr(backend, "journal", None)):
+                try:
+                    size += os.stat(p).st_size * DATA_EXPANSION if p is not None else 0
+                except FileNotFoundError:
+                    pass
+        return size + sum(len(v) for c in (self.fragments, self.feeds) for v in c.values())
+
+class Tenants:
+    """Configured tenants; the loaded ones are kept least recently used first
+    and evicted once their estimated memory exceeds `budget` bytes. The
+    tenant being asked for is never evicted."""
+
+    def __init__(self, configs, open_tenant, budget, default=None):
+        self.configs = {c.name: c for c in configs}
+        self.default = default
+        self.budget = budget
+        self._hosts = {h: c.name for c in configs for h in c.hosts}
+        self._open = open_tenant  # TenantConfig -> Tenant, must not block
+        self._loaded = OrderedDict()
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def by_host(self, host):
+        return self._hosts.get(host.rsplit(":", 1)[0].lower()) if self._hosts else None
+
+    def get(self, name):
+        with self._lock:
+            tenant = self._loaded.get(name)
+            if tenant is None:
+                tenant = self._loaded[name] = self._open(self.configs[name])
+                TENANT_EVENTS.inc(event="load")
+                self._evict(name)
+            elif time.monotonic() - self._checked > CHECK_SECONDS:
+                self._evict(name)
+            self._loaded.move_to_end(name)
+            return tenant
+
+    def _evict(self, keep):
+        self._checked = time.monotonic()
+        sizes = {name: t.memory() for name, t in self._loaded.items()}
+        total = sum(sizes.values())
+        for name in list(self._loaded):
+            if total <= self.budget:
+                break
+            if name != keep:
+                # Requests still running keep their reference; a later one reloads
+                del self._loaded[name]
+                total -= sizes[name]
+                TENANT_EVENTS.inc(event="evict")
+
+    def loaded(self):
+        with self._lock:
+            return list(self._loaded.values())
+
+class TenantMiddleware:
+    """Picks the tenant of a request by host name, else by the first path
+    segment, which then moves into SCRIPT_NAME so that url_for() keeps it.
+    Requests matching neither go to the default tenant, if any."""
+
+    def __init__(self, wsgi_app, tenants):
+        self.wsgi_app = wsgi_app
+        self.tenants = tenants
+
+    def __call__(self, environ, start_response):
+        name = self.tenants.by_host(environ.get("HTTP_HOST", ""))
+        if name is None:
+            first, sep, rest = environ.get("PATH_INFO", "").lstrip("/").partition("/")
+            if first in self.tenants.configs:
+                name = first
+                environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + "/" + first
+                environ["PATH_INFO"] = "/" + rest
+        if name is not None:
+            environ[ENVIRON_KEY] = name
+        return self.wsgi_app(environ, start_response)
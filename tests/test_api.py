@@ -1,15 +1,417 @@
 import pytest
+import app as app_module
 from app import app
+from store import DataStore
+from backends import YamlBackend
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "STORE", app_module._open_store(YamlBackend(tmp_path / "data.yaml")))
+    monkeypatch.setattr(app_module, "FRAGMENTS", app_module.LRUCache(64))
+    monkeypatch.setattr(app_module, "VIEWS", app_module.ViewCache())
+    monkeypatch.setattr(app_module, "COLD", app_module.ColdArchive(tmp_path / "archive"))
     app.testing = True
     return app.test_client()
 
+def _create(client, name="Testturnier", start="2099-05-01", end="2099-05-02"):
+    client.post('/create', data={"name": name, "start_date": start, "end_date": end})
+    return next(t for t in app_module.STORE.tournaments() if t["name"] == name)
+
 def test_index_status_code(client):
     response = client.get('/')
     assert response.status_code == 200
 
 def test_archive_status_code(client):
     response = client.get('/archive')
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+def test_signup_updates_existing_participant(client):
+    t = _create(client)
+    client.post(f'/signup/{t["id"]}', data={"player": "Max", "status_2099-05-01": "attending"})
+    client.post(f'/signup/{t["id"]}', data={"player": "max", "status_2099-05-01": "interested"})
+    t = app_module.STORE.get(t["id"])
+    assert len(t["participants"]) == 1
+    assert t["participants"][0]["statuses"] == {"2099-05-01": "interested"}
+    assert "dates" not in t
+
+def test_yaml_sqlite_round_trip(client, tmp_path, monkeypatch):
+    t = _create(client)
+    client.post(f'/signup/{t["id"]}', data={"player": "Max", "status_2099-05-01": "attending"})
+    monkeypatch.setattr(app_module, "SQLITE_FILE", tmp_path / "data.sqlite3")
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["import-yaml", str(tmp_path / "data.yaml")])
+    assert "1 Turniere" in result.output
+    result = runner.invoke(args=["export-yaml", str(tmp_path / "export.yaml")])
+    exported = DataStore(YamlBackend(tmp_path / "export.yaml"))
+    assert exported.tournaments() == app_module.STORE.tournaments()
+
+def test_cards_are_rendered_from_fragment_cache(client):
+    a = _create(client, "Cup A")
+    _create(client, "Cup B")
+    client.get('/').get_data()
+    assert app_module.FRAGMENTS.stats()["misses"] == 2
+    client.post(f'/signup/{a["id"]}', data={"player": "Max", "status_2099-05-01": "attending"})
+    html = client.get('/').get_data(as_text=True)
+    stats = client.get('/api/cache_stats').get_json()["fragments"]
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert "Max" in html and "Cup B" in html
+
+def test_calendar_lists_overlapping_tournaments(client):
+    _create(client, "Cup A", "2099-05-01", "2099-05-03")
+    _create(client, "Cup B", "2099-05-02", "2099-05-02")
+    html = client.get('/').get_data(as_text=True)
+    assert 'title="Cup A, Cup B"' in html
+
+def test_archive_with_past_tournament(client):
+    _create(client, "Old Cup", "2000-01-01", "2000-01-01")
+    html = client.get('/archive').get_data(as_text=True)
+    assert "Old Cup" in html
+
+def test_search_endpoint(client):
+    t = _create(client, "Spring Cup")
+    _create(client, "Autumn Open")
+    client.post(f'/signup/{t["id"]}', data={"player": "Anna Schmidt"})
+    result = client.get('/api/search?q=schmidt spring').get_json()
+    assert [r["name"] for r in result] == ["Spring Cup"]
+
+def test_overview_answers_conditional_get_with_304(client):
+    _create(client)
+    first = client.get('/')
+    etag = first.headers["ETag"]
+    again = client.get('/', headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.get_data() == b""
+    assert client.get('/archive', headers={"If-None-Match": etag}).status_code == 200
+    client.set_cookie("filter", "Test")
+    assert client.get('/', headers={"If-None-Match": etag}).status_code == 200
+    client.delete_cookie("filter")
+    t = app_module.STORE.tournaments()[0]
+    client.post(f'/signup/{t["id"]}', data={"player": "Max"})
+    assert client.get('/', headers={"If-None-Match": etag}).status_code == 200
+
+def test_archive_is_paginated_by_start_date_and_grouped_by_year(client):
+    for i, start in enumerate(["2001-03-01", "2001-02-01", "2000-12-01", "2000-11-01", "2000-10-01"]):
+        _create(client, f"Old {i}", start, start)
+    html = client.get('/archive?size=2').get_data(as_text=True)
+    assert "Old 0" in html and "Old 1" in html and "Old 2" not in html
+    assert html.count('class="archive-year"') == 1
+    more = html.split('data-partial="')[1].split('"')[0].replace("&amp;", "&")
+    part = client.get(more).get_data(as_text=True)
+    assert "<html" not in part and "Old 2" in part and "Old 3" in part and "Old 4" not in part
+    assert '<h2 class="archive-year">2000</h2>' in part
+    last = client.get(part.split('data-partial="')[1].split('"')[0].replace("&amp;", "&"))
+    text = last.get_data(as_text=True)
+    assert "Old 4" in text and "archive-more" not in text and "archive-year" not in text
+    # Out-of-range sizes are clamped, malformed cursors rejected
+    assert client.get('/archive?size=-1').get_data(as_text=True).count('id="tournament-') == 1
+    assert client.get('/archive?cursor=zzz').status_code == 400
+    assert client.get('/archive?cursor=2001-3-1_x').status_code == 400
+
+def test_cold_archive_moves_old_tournaments_out_of_hot_data(client, tmp_path):
+    for i, start in enumerate(["2001-03-01", "2000-12-01", "1999-05-01"]):
+        t = _create(client, f"Old {i}", start, start)
+    client.post(f'/signup/{t["id"]}', data={"player": "Erika", "status_1999-05-01": "attending"})
+    result = app.test_cli_runner().invoke(args=["archive-cold"])
+    assert "3 Turniere" in result.output
+    assert app_module.STORE.tournaments() == []
+    assert sorted(p.name for p in (tmp_path / "archive").glob("*.yaml")) == ["1999.yaml", "2000.yaml", "2001.yaml"]
+    html = client.get('/archive?size=2').get_data(as_text=True)
+    assert "Old 0" in html and "Old 1" in html and "Old 2" not in html
+    assert "Absenden" not in html  # cold tournaments are read-only
+    more = html.split('data-partial="')[1].split('"')[0].replace("&amp;", "&")
+    part = client.get(more).get_data(as_text=True)
+    assert "Old 2" in part and "Erika" in part
+    client.set_cookie("filter", "erika")
+    html = client.get('/archive').get_data(as_text=True)
+    assert "Old 2" in html and "Old 0" not in html
+
+def test_archive_loads_cold_years_only_when_the_page_reaches_them(client, monkeypatch):
+    _create(client, "Cold Cup", "1999-05-01", "1999-05-01")
+    app.test_cli_runner().invoke(args=["archive-cold"])
+    _create(client, "Hot 0", "2099-01-01", "2099-01-01")
+    for i, start in enumerate(["2003-02-01", "2003-01-01"], 1):
+        _create(client, f"Hot {i}", start, start)
+    loaded = []
+    load = app_module.COLD.load
+    monkeypatch.setattr(app_module.COLD, "load", lambda year: loaded.append(year) or load(year))
+    html = client.get('/archive?size=2').get_data(as_text=True)
+    assert "Hot 1" in html and "Hot 2" in html and loaded == []
+    html = client.get('/archive?size=3').get_data(as_text=True)
+    assert "Cold Cup" in html and loaded == [1999]
+
+def test_name_suggestions_by_prefix_and_frequency(client):
+    a, b = _create(client, "Cup A"), _create(client, "Cup B")
+    for t in (a, b):
+        client.post(f'/signup/{t["id"]}', data={"player": "Maria"})
+    client.post(f'/signup/{a["id"]}', data={"player": "Mark"})
+    client.post(f'/signup/{a["id"]}', data={"player": "Ben"})
+    assert client.get('/api/names?prefix=MA').get_json() == ["Maria", "Mark"]
+    assert client.get('/api/names?prefix=ma&limit=1').get_json() == ["Maria"]
+    html = client.get('/').get_data(as_text=True)
+    assert '<option value="Ben">' not in html
+
+def test_batch_signups_apply_valid_entries_in_one_write(client, monkeypatch):
+    t = _create(client)
+    seq = app_module.STORE.seq
+    backend, writes = app_module.STORE.backend, []
+    append = backend.append
+    monkeypatch.setattr(backend, "append", lambda records: (writes.append(records), append(records)))
+    resp = client.post('/api/signups', json=[
+        {"tournament_id": t["id"], "player": "Anna", "statuses": {"2099-05-01": "attending"}},
+        {"tournament_id": t["id"], "player": "Ben", "statuses": {"2099-5-2": "interested"}},
+        {"tournament_id": t["id"], "player": "Carl", "statuses": {"2099-06-01": "attending"}},
+        {"tournament_id": "nope", "player": "Dora"},
+        {"tournament_id": t["id"], "player": " "},
+        {"tournament_id": [t["id"]], "player": "Emil"},
+        {"tournament_id": t["id"], "player": ["Fritz"]},
+    ])
+    body = resp.get_json()
+    assert body["applied"] == 2
+    assert [r["ok"] for r in body["results"]] == [True, True, False, False, False, False, False]
+    assert "2099-06-01" in body["results"][2]["error"]
+    names = sorted(p["name"] for p in app_module.STORE.get(t["id"])["participants"])
+    assert names == ["Anna", "Ben"]
+    assert app_module.STORE.participant(t["id"], "Ben")["statuses"] == {"2099-05-02": "interested"}
+    assert [d["interested"] for d in app_module._headcounts(t["id"])] == [0, 1]
+    assert app_module.STORE.seq == seq + 2 and len(writes) == 1
+    assert client.post('/api/signups', json={"foo": 1}).status_code == 400
+    # Checked under the write lock: a tournament another worker deleted
+    # before the write is reported, not silently skipped
+    other = DataStore(YamlBackend(backend.path))
+    lock = backend.lock
+    def lock_after_delete(exclusive=True):
+        monkeypatch.setattr(backend, "lock", lock)
+        other.apply({"op": "delete_tournament", "tid": t["id"]})
+        return lock(exclusive)
+    monkeypatch.setattr(backend, "lock", lock_after_delete)
+    body = client.post('/api/signups', json=[{"tournament_id": t["id"], "player": "Dora"}]).get_json()
+    assert body["applied"] == 0 and body["results"][0]["ok"] is False
+
+def test_readiness_reports_warmup(client, monkeypatch):
+    monkeypatch.setattr(app_module, "READY", {"templates": False, "data": True})
+    assert client.get('/healthz/ready').status_code == 503
+    # Without a gunicorn hook (flask run) the first request warms up
+    monkeypatch.setattr(app_module, "READY", {"templates": True, "data": False})
+    resp = client.get('/healthz/ready')
+    assert resp.status_code == 200 and resp.get_json()["ready"] is True
+
+def test_live_updates_patch_rows_instead_of_redirecting(client, monkeypatch):
+    t = _create(client)
+    resp = client.post(f'/signup/{t["id"]}', headers={"Accept": "application/json"},
+                       data={"player": "Max", "status_2099-05-01": "attending"})
+    row = resp.get_json()
+    assert resp.status_code == 200 and 'data-pid="%s"' % row["pid"] in row["html"]
+    assert client.post(f'/signup/{t["id"]}', headers={"Accept": "application/json"},
+                       data={"player": ""}).status_code == 400
+    # A stale page posting to a deleted tournament writes nothing
+    seq = app_module.STORE.seq
+    assert client.post('/signup/gone', headers={"Accept": "application/json"},
+                       data={"player": "Max"}).status_code == 404
+    assert client.post('/edit_tournament/gone', data={"link": ""}).status_code == 302
+    assert app_module.STORE.seq == seq
+    # A reconnecting browser gets every change after its Last-Event-ID
+    monkeypatch.setattr(app_module, "EVENTS_STREAM_SECONDS", 0.2)
+    body = client.get('/events', headers={"Last-Event-ID": "1"}).get_data(as_text=True)
+    assert "id: 2\nevent: row\n" in body and row["pid"] in body
+    body = client.get('/events', headers={"Last-Event-ID": "999"}).get_data(as_text=True)
+    assert "event: changed" in body
+    # Pages turned away for lack of a stream poll the same feed
+    monkeypatch.setattr(app_module, "_STREAM_SLOTS", app_module.threading.BoundedSemaphore(1))
+    held = client.get('/events')
+    assert client.get('/events').status_code == 503
+    held.close()
+    # Requests that fail before streaming leave the slot free
+    feed_tick = app_module.STORE.feed_tick
+    monkeypatch.setattr(app_module.STORE, "feed_tick", lambda seq: app_module.abort(404))
+    assert [client.get('/events').status_code for _ in range(2)] == [404, 404]
+    monkeypatch.setattr(app_module.STORE, "feed_tick", feed_tick)
+    assert client.get('/events').status_code == 200
+    body = client.get('/events/poll?since=1').get_json()
+    assert body["seq"] == 2 and [(e["seq"], e["event"]) for e in body["events"]] == [(2, "row")]
+    assert body["events"][0]["data"]["pid"] == row["pid"]
+    assert client.get('/events/poll?since=999').get_json()["events"][0]["event"] == "changed"
+    # Nothing new: the poll is answered with 304
+    resp = client.get('/events/poll?since=2')
+    assert resp.get_json()["events"] == []
+    assert client.get('/events/poll?since=2', headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+
+def test_metrics_endpoint_exports_routes_persistence_and_data(client):
+    _create(client)
+    client.get('/').close()  # a streamed page is recorded once it is sent
+    text = client.get('/metrics').get_data(as_text=True)
+    # Metrics are process-wide, other tests count too
+    assert 'http_requests_total{route="/",method="GET",status="200"} ' in text
+    assert 'http_request_duration_seconds_bucket{route="/",method="GET",le="+Inf"}' in text
+    assert 'persistence_duration_seconds_count{operation="journal_append"}' in text
+    assert 'render_duration_seconds_count{part="calendar"}' in text
+    assert "tournaments 1" in text and 'data_file_bytes{file="data.yaml.journal"}' in text
+
+def test_admin_can_request_a_profile_report(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "PROFILE_DIR", tmp_path / "profiles")
+    assert "X-Profile-Report" not in client.get('/', headers={"X-Profile": "1"}).headers
+    _create(client)
+    client.post('/admin', data={"password": app_module.ADMIN_PASSWORD})
+    with client.get('/', headers={"X-Profile": "1"}) as resp:
+        report = resp.headers["X-Profile-Report"]
+        resp.get_data()
+    # Written once the streamed page is complete, so it covers the cards too
+    text = (tmp_path / "profiles" / report).read_text()
+    assert "cumulative" in text and "_timed_card" in text
+    # One profiled request at a time: the others are counted, not profiled
+    skipped = dict(app_module.PROFILES_SKIPPED._values).get((), 0)
+    with app_module._PROFILING:
+        assert "X-Profile-Report" not in client.get('/api/search', headers={"X-Profile": "1"}).headers
+    assert f"profiles_skipped_total {skipped + 1}" in client.get('/metrics').get_data(as_text=True)
+    assert "X-Profile-Report" in client.get('/api/search', headers={"X-Profile": "1"}).headers
+
+def test_headcounts_in_table_header_and_api(client):
+    t = _create(client)
+    for name, status in [("Max", "attending"), ("Erika", "attending"), ("Otto", "interested")]:
+        client.post(f'/signup/{t["id"]}', data={"player": name, "status_2099-05-01": status})
+    assert "✓ 2 · ? 1" in client.get('/').get_data(as_text=True)
+    days = client.get('/api/headcounts').get_json()[0]["days"]
+    assert days == [{"date": "2099-05-01", "attending": 2, "interested": 1},
+                    {"date": "2099-05-02", "attending": 0, "interested": 0}]
+
+def test_view_models_are_built_once_per_version(client):
+    a, b = _create(client, "A"), _create(client, "B")
+    first = {v.id: v for v in app_module._upcoming()}
+    assert app_module._upcoming() is app_module._upcoming()
+    client.post(f'/signup/{a["id"]}', data={"player": "Max"})
+    second = {v.id: v for v in app_module._upcoming()}
+    assert second[b["id"]] is first[b["id"]] and second[a["id"]] is not first[a["id"]]
+    assert second[a["id"]].participants[0].name == "Max"
+
+def test_static_assets_are_fingerprinted_and_precompressed(client):
+    import gzip
+    _create(client)
+    html = client.get('/').get_data(as_text=True)
+    css = html.split('rel="stylesheet" href="')[1].split('"')[0]
+    assert css.startswith('/static/app.') and css != '/static/app.css'
+    assert client.get('/static/app.css').status_code == 404
+    resp = client.get(css, headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip" and "immutable" in resp.headers["Cache-Control"]
+    assert b"--accent" in gzip.decompress(resp.data)
+    sprite = html.split('<use href="')[1].split('#')[0]
+    assert client.get(sprite).mimetype == "image/svg+xml"
+
+def test_html_is_compressed_and_revalidates_with_weak_etag(client, monkeypatch):
+    import gzip
+    _create(client)
+    resp = client.get('/', headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip" and "Accept-Encoding" in resp.headers["Vary"]
+    assert "Turnierverwaltung" in gzip.decompress(resp.data).decode("utf8")
+    etag = resp.headers["ETag"]
+    assert etag.startswith('W/')
+    assert client.get('/', headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 304
+    # A deploy with other assets invalidates the cached pages
+    monkeypatch.setattr(app_module, "BUILD", "next-release")
+    assert client.get('/', headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 200
+
+def test_calendar_feeds_with_conditional_get(client):
+    t = _create(client, "Sommer, Cup", "2099-05-01", "2099-05-03")
+    _create(client, "Other", "2099-06-01", "2099-06-01")
+    client.post(f'/signup/{t["id"]}', data={"player": "Max", "status_2099-05-01": "attending",
+                                            "status_2099-05-02": "attending", "status_2099-05-03": "interested"})
+    resp = client.get('/calendar.ics')
+    body = resp.get_data(as_text=True)
+    assert resp.mimetype == "text/calendar" and body.count("BEGIN:VEVENT") == 2
+    assert "SUMMARY:Sommer\\, Cup\r\n" in body and "DTEND;VALUE=DATE:20990504" in body
+    assert client.get('/calendar.ics', headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+    assert client.get('/calendar.ics', headers={
+        "If-Modified-Since": resp.headers["Last-Modified"]}).status_code == 304
+    body = client.get('/calendar/max.ics').get_data(as_text=True)
+    assert body.count("BEGIN:VEVENT") == 2 and "Other" not in body
+    assert "DTSTART;VALUE=DATE:20990501\r\nDTEND;VALUE=DATE:20990503" in body
+    assert "SUMMARY:Sommer\\, Cup (Interesse)" in body
+    # A signup changes the version, so the old ETag no longer matches
+    etag = client.get('/calendar/max.ics').headers["ETag"]
+    client.post(f'/signup/{t["id"]}', data={"player": "Max"})
+    resp = client.get('/calendar/max.ics', headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and "BEGIN:VEVENT" not in resp.get_data(as_text=True)
+
+def test_admin_panel_pages_searches_and_bulk_deletes_in_one_write(client, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_PAGE_SIZE", 2)
+    ts = [_create(client, f"Cup {i}", f"2099-0{i + 1}-01", f"2099-0{i + 1}-01") for i in range(3)]
+    for name in ("Anna", "Ben"):
+        client.post(f'/signup/{ts[0]["id"]}', data={"player": name})
+    client.post('/admin', data={"password": app_module.ADMIN_PASSWORD})
+    html = client.get('/admin').get_data(as_text=True)
+    assert "Cup 2" in html and "Cup 1" in html and "Cup 0" not in html and "Seite 1 von 2" in html
+    assert "Cup 0" in client.get('/admin?page=2').get_data(as_text=True)
+    html = client.get('/admin?q=anna').get_data(as_text=True)
+    assert "Cup 0" in html and "Cup 1" not in html
+    assert "Cup 1" in client.get('/admin?from=2099-02-01&until=2099-02-28').get_data(as_text=True)
+    anna = app_module.STORE.participant(ts[0]["id"], "Anna")
+    backend, writes = app_module.STORE.backend, []
+    append = backend.append
+    monkeypatch.setattr(backend, "append", lambda records: (writes.append(records), append(records)))
+    client.post('/admin/bulk_delete', data={"tournament": [ts[1]["id"], ts[2]["id"]],
+                                            "participant": [f'{ts[0]["id"]}:{anna["id"]}']})
+    assert len(writes) == 1 and len(writes[0]) == 3
+    assert [p["name"] for p in app_module.STORE.get(ts[0]["id"])["participants"]] == ["Ben"]
+    assert [t["id"] for t in app_module.STORE.tournaments()] == [ts[0]["id"]]
+
+def test_admin_purge_drops_hot_and_cold_tournaments(client):
+    _create(client, "Old hot", "2000-01-01", "2000-01-02")
+    _create(client, "Keep", "2099-01-01", "2099-01-01")
+    app_module.COLD.add([{"id": "c1", "name": "Old cold", "start_date": "1999-01-01",
+                          "end_date": "1999-01-01", "participants": []}])
+    client.post('/admin', data={"password": app_module.ADMIN_PASSWORD})
+    assert client.post('/admin/purge', data={"before": "2001-01-01"}).status_code == 302
+    assert [t["name"] for t in app_module.STORE.tournaments()] == ["Keep"]
+    assert app_module.COLD.years() == []
+
+def _tenants(tmp_path, budget=2**30):
+    from tenants import TenantConfig, Tenants
+    configs = [TenantConfig(name, tmp_path / name / "data.yaml", tmp_path / name / "data.sqlite3",
+                            tmp_path / name / "archive", f"pw-{name}", hosts)
+               for name, hosts in (("nord", ()), ("sued", ("sued.example",)))]
+    return Tenants(configs, app_module._open_tenant, budget)
+
+def test_tenants_by_prefix_or_host_with_own_data_and_admin(tmp_path, monkeypatch):
+    from tenants import TenantMiddleware
+    tenants = _tenants(tmp_path)
+    monkeypatch.setattr(app_module, "TENANTS", tenants)
+    monkeypatch.setattr(app, "wsgi_app", TenantMiddleware(app.wsgi_app, tenants))
+    app.testing = True
+    client = app.test_client()
+    resp = client.post('/nord/create', data={"name": "Nord Cup", "start_date": "2099-05-01"})
+    assert resp.headers["Location"] == "/nord/"
+    assert "Nord Cup" in client.get('/nord/').get_data(as_text=True)
+    assert "Nord Cup" not in client.get('/', headers={"Host": "sued.example"}).get_data(as_text=True)
+    assert "/nord/static/app." in client.get('/nord/').get_data(as_text=True)
+    assert client.get('/').status_code == 404  # no default tenant
+    client.post('/sued/admin', data={"password": "pw-nord"})
+    client.post('/nord/admin', data={"password": "pw-nord"})
+    html = client.get('/nord/admin?page=1').get_data(as_text=True)
+    assert "Logout" in html and 'name="next" value="/nord/admin?page=1"' in html
+    assert "Logout" not in client.get('/sued/admin').get_data(as_text=True)
+    resp = client.post('/nord/admin/bulk_delete', data={"next": "/nord/admin?page=1"})
+    assert resp.headers["Location"] == "/nord/admin?page=1"
+    resp = client.post('/nord/admin/bulk_delete', data={"next": "/admin"})
+    assert resp.headers["Location"] == "/nord/admin"
+
+def test_idle_tenants_are_evicted_over_budget_and_reloaded(tmp_path):
+    tenants = _tenants(tmp_path, budget=1)
+    nord = tenants.get("nord")
+    nord.store.apply({"op": "create", "tournament": {
+        "id": "t1", "name": "Cup", "start_date": "2099-05-01", "end_date": "2099-05-01",
+        "participants": []}})
+    assert nord.memory() > 1
+    tenants.get("sued")
+    assert [t.name for t in tenants.loaded()] == ["sued"]
+    again = tenants.get("nord")
+    assert again is not nord and again.store.get("t1")["name"] == "Cup"
+
+def test_overview_streams_calendar_before_rendering_cards(client):
+    import zlib
+    _create(client, "Cup A")
+    chunks = iter(client.get('/', buffered=False).response)
+    head = next(chunks).decode("utf8")
+    assert 'class="cal-wrapper"' in head and head.rstrip().endswith('<div class="grid">')
+    assert app_module.FRAGMENTS.stats()["misses"] == 0  # no card rendered yet
+    assert 'id="tournament-' in b"".join(chunks).decode("utf8")
+    # Compressed, every chunk can be decoded as soon as it arrives
+    chunks = iter(client.get('/', headers={"Accept-Encoding": "gzip"}, buffered=False).response)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert b'class="cal-wrapper"' in decoder.decompress(next(chunks))
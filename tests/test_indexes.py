@@ -0,0 +1,94 @@
+import datetime as dt
+from indexes import IntervalIndex
+
+D = dt.date
+
+def test_interval_index_reports_every_overlapping_tournament():
+    ix = IntervalIndex([
+        (D(2099, 5, 1), D(2099, 5, 3), "long"),
+        (D(2099, 5, 2), D(2099, 5, 2), "short"),
+        (D(2099, 6, 1), D(2099, 6, 1), "later"),
+    ])
+    assert ix.covering(D(2099, 5, 2)) == ["long", "short"]
+    assert ix.covering(D(2099, 5, 3)) == ["long"]
+    assert ix.covering(D(2099, 5, 4)) == []
+    assert ix.overlapping(D(2099, 5, 3), D(2099, 6, 30)) == ["long", "later"]
+    days = ix.by_day(D(2099, 5, 2), D(2099, 5, 31))
+    assert days == {D(2099, 5, 2).toordinal(): ["long", "short"], D(2099, 5, 3).toordinal(): ["long"]}
+
+def _t(tid, name, location="", participants=()):
+    return {"id": tid, "name": name, "location": location,
+            "participants": [{"name": p} for p in participants]}
+
+def test_search_index_matches_all_terms_and_follows_updates():
+    from indexes import SearchIndex
+    ix = SearchIndex()
+    ix.rebuild([_t("a", "Spring Cup", "Aachen", ["Anna Schmidt"]),
+                _t("b", "Autumn Open", "Köln", ["Ben"])])
+    assert ix.search("cup") == {"a"}
+    assert ix.search("KÖLN") == {"b"}
+    assert ix.search("an") == {"a"}  # shorter than a trigram
+    assert ix.search("anna aachen") == {"a"}
+    assert ix.search("anna köln") == set()
+    ix.update("b", _t("b", "Autumn Open", "Köln", ["Ben", "Anna"]))
+    assert ix.search("anna") == {"a", "b"}
+    ix.update("a", None)
+    assert ix.search("anna") == {"b"} and ix.search("spring") == set()
+
+def test_name_index_counts_and_forgets_names():
+    from indexes import NameIndex
+    ix = NameIndex()
+    ix.rebuild([_t("a", "A", participants=["Anna", "Ben"]), _t("b", "B", participants=["anna"])])
+    assert ix.complete("an") == ["anna"]
+    assert ix.complete("") == ["anna", "Ben"]
+    ix.update("b", None)
+    ix.update("a", _t("a", "A", participants=["Ben"]))
+    assert ix.complete("a") == [] and ix.complete("b") == ["Ben"]
+
+def test_attendance_matrix_keeps_headcounts_current():
+    from indexes import AttendanceIndex
+    t = {"id": "a", "start_date": "2099-05-01", "end_date": "2099-05-02", "participants": [
+        {"id": "p1", "name": "Anna", "statuses": {"2099-05-01": "attending", "2099-05-02": "interested"}},
+        {"id": "p2", "name": "Ben", "statuses": {"2099-05-01": "attending"}},
+    ]}
+    ix = AttendanceIndex()
+    ix.rebuild([t])
+    m = ix.get("a")
+    assert [(d["attending"], d["interested"]) for d in m.headcounts()] == [(2, 0), (0, 1)]
+    t["participants"][0]["statuses"] = {"2099-05-02": "attending"}
+    t["participants"] = t["participants"][1:] + [{"id": "p3", "name": "Cleo", "statuses": {}}]
+    ix.update("a", t)
+    assert [(d["attending"], d["interested"]) for d in m.headcounts()] == [(1, 0), (0, 0)]
+    assert m.statuses("p3") == ["no", "no"] and m.statuses("p2") == ["attending", "no"]
+    ix.update("a", None)
+    assert ix.get("a") is None
+
+def test_search_index_can_be_read_while_it_is_updated():
+    import sys, threading
+    from indexes import SearchIndex
+    ix = SearchIndex()
+    ix.rebuild([_t(str(i), f"Cup {i}") for i in range(200)])
+    errors, done = [], threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                ix.search("cu")
+                ix.search("cup 1")
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for th in readers:
+            th.start()
+        for n in range(3000):
+            ix.update(str(n % 200), _t(str(n % 200), f"Cup {n % 200}", participants=[f"P{n}"]))
+    finally:
+        done.set()
+        for th in readers:
+            th.join()
+        sys.setswitchinterval(interval)
+    assert errors == []
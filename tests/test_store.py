@@ -0,0 +1,220 @@
+import threading, time
+import pytest
+import yaml
+from store import DataStore
+from backends import YamlBackend, SqliteBackend
+
+def _tournament(tid, name="Cup"):
+    return {"id": tid, "name": name, "start_date": "2099-01-01", "end_date": "2099-01-01",
+            "location": "", "link": "", "description": "", "participants": []}
+
+def test_indexes_follow_writes(tmp_path):
+    store = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    store.apply({"op": "create", "tournament": _tournament("t1")},
+                {"op": "signup", "tid": "t1", "pid": "p1", "name": "Anna", "statuses": {}})
+    assert store.get("t1")["name"] == "Cup"
+    assert store.by_pid["p1"][1]["name"] == "Anna"
+    assert store.participant("t1", "ANNA")["id"] == "p1"
+    store.apply({"op": "signup", "tid": "t1", "pid": "p9", "name": "anna", "statuses": {"2099-01-01": "no"}},
+                {"op": "create", "tournament": _tournament("t2")},
+                {"op": "delete_participant", "tid": "t2", "pid": "p1"})
+    assert store.by_pid["p1"][1]["statuses"] == {"2099-01-01": "no"} and "p9" not in store.by_pid
+    store.apply({"op": "delete_participant", "tid": "t1", "pid": "p1"})
+    assert "p1" not in store.by_pid and "anna" not in store.by_name
+    assert store.get("t1")["participants"] == []
+
+def test_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / "data.yaml"
+    store = DataStore(YamlBackend(path))
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    store.compact()
+    assert store.refresh() is False
+    path.write_text(yaml.safe_dump({"tournaments": [_tournament("t2", "Hand edited")]}))
+    assert store.refresh() is True
+    assert [t["id"] for t in store.tournaments()] == ["t2"]
+
+def test_writes_go_to_journal_and_compact(tmp_path):
+    path = tmp_path / "data.yaml"
+    store = DataStore(YamlBackend(path))
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    assert not path.exists() and store.backend.journal.stat().st_size > 0
+    store.compact()
+    assert store.backend.journal.stat().st_size == 0
+    saved = yaml.safe_load(path.read_text())
+    assert saved["seq"] == 1 and saved["tournaments"][0]["id"] == "t1"
+    assert [t["id"] for t in DataStore(YamlBackend(path)).tournaments()] == ["t1"]
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    path = tmp_path / "data.yaml"
+    a, b = DataStore(YamlBackend(path)), DataStore(YamlBackend(path))
+    a.apply({"op": "create", "tournament": _tournament("t1")})
+    a.apply({"op": "signup", "tid": "t1", "pid": "p1", "name": "Anna", "statuses": {}})
+    b.apply({"op": "signup", "tid": "t1", "pid": "p2", "name": "Ben", "statuses": {}})
+    names = sorted(p["name"] for p in a.get("t1")["participants"])
+    assert names == ["Anna", "Ben"] and a.seq == b.seq == 3
+
+def test_replay_skips_folded_records_and_torn_tail(tmp_path):
+    path = tmp_path / "data.yaml"
+    store = DataStore(YamlBackend(path))
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    journal = store.backend.journal.read_bytes()
+    store.compact()
+    # Simulate a crash between compaction and journal truncation plus a torn append
+    store.backend.journal.write_bytes(journal + b'{"seq": 2, "op": {"op": "del')
+    assert [t["id"] for t in DataStore(YamlBackend(path)).tournaments()] == ["t1"]
+    # The next write replaces the torn tail instead of continuing it
+    store.apply({"op": "create", "tournament": _tournament("t2")})
+    assert [t["id"] for t in DataStore(YamlBackend(path)).tournaments()] == ["t1", "t2"]
+
+def test_sqlite_backend_matches_yaml(tmp_path):
+    stores = [DataStore(YamlBackend(tmp_path / "data.yaml")),
+              DataStore(SqliteBackend(tmp_path / "data.sqlite3"))]
+    for store in stores:
+        store.apply({"op": "create", "tournament": _tournament("t1", "Spring Cup")},
+                    {"op": "create", "tournament": dict(_tournament("t2", "Old Cup"),
+                                                        start_date="2000-01-01", end_date="2000-01-02")},
+                    {"op": "signup", "tid": "t1", "pid": "p1", "name": "Anna", "statuses": {"2099-01-01": "attending"}},
+                    {"op": "signup", "tid": "t1", "pid": "p2", "name": "anna", "statuses": {"2099-01-01": "no"}},
+                    {"op": "edit", "tid": "t1", "link": "https://x", "description": "d"})
+    reloaded = DataStore(SqliteBackend(tmp_path / "data.sqlite3"))
+    assert reloaded.tournaments() == stores[0].tournaments()
+    for store in stores + [reloaded]:
+        upcoming, archive = store.split("2024-01-01")
+        assert [t["id"] for t in upcoming] == ["t1"] and [t["id"] for t in archive] == ["t2"]
+        assert store.search("ANN") == {"t1"} and store.search("old") == {"t2"}
+
+def test_sqlite_workers_catch_up_from_change_log(tmp_path):
+    a = DataStore(SqliteBackend(tmp_path / "data.sqlite3"))
+    b = DataStore(SqliteBackend(tmp_path / "data.sqlite3"))
+    a.apply({"op": "create", "tournament": _tournament("t1")})
+    assert b.get("t1") is not None
+    b.apply({"op": "delete_tournament", "tid": "t1"})
+    assert a.tournaments() == []
+
+def test_sqlite_change_log_is_pruned_from_the_write_path(tmp_path):
+    store = DataStore(SqliteBackend(tmp_path / "data.sqlite3", keep_changes=2))
+    for i in range(5):
+        store.apply({"op": "create", "tournament": _tournament(f"t{i}")})
+    for _ in range(100):  # compaction runs in a background thread
+        if not store._compacting:
+            break
+        time.sleep(0.01)
+    conn = store.backend._conn()
+    assert [seq for seq, in conn.execute("SELECT seq FROM changes ORDER BY seq")] == [4, 5]
+    assert not store.backend.needs_compaction()
+    assert len(DataStore(SqliteBackend(tmp_path / "data.sqlite3")).tournaments()) == 5
+
+def test_group_commit_coalesces_concurrent_submissions(tmp_path):
+    store = DataStore(YamlBackend(tmp_path / "data.yaml"), commit_window=0.2, commit_max_ops=8)
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    writes = []
+    append = store.backend.append
+    store.backend.append = lambda records: (writes.append(len(records)), append(records))
+    threads = [threading.Thread(target=store.submit, args=(
+        {"op": "signup", "tid": "t1", "pid": f"p{i}", "name": f"P{i}", "statuses": {}},))
+        for i in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert sum(writes) == 8 and len(writes) < 8
+    assert len(DataStore(YamlBackend(tmp_path / "data.yaml")).get("t1")["participants"]) == 8
+
+def test_change_feed_wakes_subscribers_for_other_workers_writes(tmp_path):
+    a = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    b = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    tick = b.feed_tick(None)
+    timer = threading.Timer(0.1, a.apply, ({"op": "create", "tournament": _tournament("t1")},))
+    timer.start()
+    entries = b.wait_changes(tick, timeout=5)
+    timer.join()
+    assert [(seq, op["op"]) for _, seq, op in entries] == [(1, "create")]
+    assert b.wait_changes(entries[-1][0], timeout=0) == []
+    assert b.feed_tick(1) == entries[-1][0] and b.feed_tick(99) is None
+
+def test_change_feed_follows_on_from_a_full_load(tmp_path):
+    a = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    a.apply({"op": "create", "tournament": _tournament("t1")})
+    a.compact()
+    b = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    b.refresh()  # full load at seq 1, as on warm-up
+    a.apply({"op": "signup", "tid": "t1", "pid": "p1", "name": "Anna", "statuses": {}})
+    entries = b.wait_changes(b.feed_tick(1), timeout=0)
+    assert [(seq, op and op["op"]) for _, seq, op in entries] == [(2, "signup")]
+    # Reloaded after the other worker's compaction: still patched, not "changed"
+    a.compact()
+    b.refresh()
+    a.apply({"op": "edit", "tid": "t1", "link": "", "description": "x"})
+    entries = b.wait_changes(b.feed_tick(2), timeout=0)
+    assert [(seq, op and op["op"]) for _, seq, op in entries] == [(3, "edit")]
+
+def test_other_workers_compaction_keeps_versions_and_feed_quiet(tmp_path):
+    path = tmp_path / "data.yaml"
+    a, b = DataStore(YamlBackend(path)), DataStore(YamlBackend(path))
+    a.apply({"op": "create", "tournament": _tournament("t1")},
+            {"op": "create", "tournament": _tournament("t2")})
+    tick, versions = b.feed_tick(None), dict(b.versions)
+    a.compact()
+    assert b.wait_changes(tick, 0) == [] and b.versions == versions
+    # A hand edit is a real change: only the edited tournament gets a new version
+    path.write_text(yaml.safe_dump({"seq": 2, "tournaments": [_tournament("t1"), _tournament("t2", "Edited")]}))
+    entries = b.wait_changes(tick, 0)
+    assert [(seq, op) for _, seq, op in entries] == [(2, None)]
+    assert b.versions["t1"] == versions["t1"] and b.versions["t2"] != versions["t2"]
+
+def test_ops_that_change_nothing_are_not_persisted(tmp_path):
+    store = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    journal = store.backend.journal.read_bytes()
+    applied = store.apply_with(lambda tournaments: [
+        {"op": "signup", "tid": "gone", "pid": "p1", "name": "Anna", "statuses": {}},
+        {"op": "delete_participant", "tid": "t1", "pid": "p9"},
+        {"op": "create", "tournament": _tournament("t1")}])
+    assert applied == [] and store.seq == 1 and store.backend.journal.read_bytes() == journal
+    # Pollers that saw seq 1 still follow on with the next real change
+    store.apply({"op": "edit", "tid": "t1", "link": "", "description": "x"})
+    assert [seq for _, seq, _ in store.wait_changes(store.feed_tick(1), 0)] == [2]
+
+def test_binary_snapshot_is_used_until_the_yaml_changes(tmp_path, monkeypatch):
+    import backends
+    path = tmp_path / "data.yaml"
+    backends.save_yaml(path, {"tournaments": [_tournament("t1", "Cup A")]})
+    assert (tmp_path / "data.yaml.bin").exists()
+    parsed, load = [], backends.yaml.load
+    monkeypatch.setattr(backends.yaml, "load", lambda *a, **kw: parsed.append(1) or load(*a, **kw))
+    assert backends.load_yaml(path)["tournaments"][0]["name"] == "Cup A" and not parsed
+    # Same size, different content: the hash catches it
+    path.write_text(path.read_text().replace("Cup A", "Cup B"))
+    assert backends.load_yaml(path)["tournaments"][0]["name"] == "Cup B" and parsed == [1]
+    assert backends.load_yaml(path)["tournaments"][0]["name"] == "Cup B" and parsed == [1]
+
+def test_failed_write_is_not_kept_in_memory(tmp_path, monkeypatch):
+    store = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    store.apply({"op": "create", "tournament": _tournament("t1")})
+    def fail(records):
+        raise OSError("disk full")
+    monkeypatch.setattr(store.backend, "append", fail)
+    with pytest.raises(OSError):
+        store.submit({"op": "signup", "tid": "t1", "pid": "p1", "name": "Max", "statuses": {}})
+    assert store.get("t1")["participants"] == [] and store.seq == 1
+
+def test_cold_move_runs_under_the_write_lock_in_one_process(tmp_path):
+    from tiering import ColdArchive, move_cold, _leader
+    store = DataStore(YamlBackend(tmp_path / "data.yaml"))
+    store.apply({"op": "create", "tournament": dict(_tournament("t1"), end_date="2000-01-01")})
+    cold = ColdArchive(tmp_path / "archive")
+    assert move_cold(store, cold, "2001-01-01") == 1 and move_cold(store, cold, "2001-01-01") == 0
+    assert store.tournaments() == [] and [t["id"] for t in cold.load(2099)[0]] == ["t1"]
+    assert not list(tmp_path.glob("**/*.tmp"))
+    assert _leader(tmp_path / "tiering.lock") and not _leader(tmp_path / "tiering.lock")
+
+def test_binary_snapshot_keeps_yaml_dates(tmp_path, monkeypatch):
+    import backends, datetime as dt
+    path = tmp_path / "data.yaml"
+    path.write_text("tournaments:\n- id: t1\n  start_date: 2099-01-01\n"
+                    "  participants: [{id: p1, statuses: {2099-01-01: attending}}]\n")
+    parsed = backends.load_yaml(path)
+    monkeypatch.setattr(backends.yaml, "load", None)  # from here on only the snapshot
+    assert backends.load_yaml(path) == parsed
+    assert parsed["tournaments"][0]["participants"][0]["statuses"] == {dt.date(2099, 1, 1): "attending"}
+    assert not list(tmp_path.glob("*.tmp"))
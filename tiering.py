@@ -0,0 +1,132 @@
+"""
+Turnierverwaltung – kaltes Archiv
+Alte Turniere werden aus der heißen Datendatei in Jahresdateien
+(archive/<jahr>.yaml) verschoben und nur bei Bedarf wieder geladen.
+"""
+import os, logging, threading, time
+from pathlib import Path
+from backends import load_yaml, save_yaml, try_lock
+from cache import LRUCache
+from indexes import SearchIndex
+
+class ColdArchive:
+    def __init__(self, directory, cache_size=8):
+        self.dir = Path(directory)
+        self._years = LRUCache(cache_size)  # year -> (file stat, tournaments, SearchIndex)
+        self._lock = threading.Lock()
+
+    def _file(self, year):
+        return self.dir / f"{year}.yaml"
+
+    def stamp(self):
+        """Changes whenever a year file is (re)written (atomic rename into the directory)."""
+        try:
+            return os.stat(self.dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def stats(self):
+        return self._years.stats()
+
+    def years(self):
+        """Years with an archive file, newest first."""
+        if not self.dir.is_dir():
+            return []
+        return sorted((int(p.stem) for p in self.dir.glob("*.yaml") if p.stem.isdigit()),
+                      reverse=True)
+
+    def load(self, year):
+        """(tournaments sorted by start date descending, SearchIndex) of one year."""
+        path = self._file(year)
+        try:
+            st = os.stat(path)
+            stat = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return [], SearchIndex()
+        cached = self._years.get(year)
+        if cached is not None and cached[0] == stat:
+            return cached[1], cached[2]
+        tournaments = load_yaml(path).get("tournaments", [])
+        tournaments.sort(key=lambda t: (str(t["start_date"]), t["id"]), reverse=True)
+        index = SearchIndex()
+        index.rebuild(tournaments)
+        self._years.put(year, (stat, tournaments, index))
+        return tournaments, index
+
+    def add(self, tournaments):
+        """Merge tournaments into their year files (by start date)."""
+        by_year = {}
+        for t in tournaments:
+            by_year.setdefault(int(str(t["start_date"])[:4]), []).append(t)
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            for year, moved in by_year.items():
+                path = self._file(year)
+                existing = load_yaml(path).get("tournaments", [])
+                ids = {t["id"] for t in moved}
+                merged = [t for t in existing if t["id"] not in ids] + moved
+                save_yaml(path, {"tournaments": merged})
+
+    def purge(self, before):
+        """Drop tournaments that ended before ISO date `before`; return how many."""
+        dropped = 0
+        with self._lock:
+            for year in self.years():
+                if year > int(before[:4]):
+                    continue
+                path = self._file(year)
+                existing = load_yaml(path).get("tournaments", [])
+                kept = [t for t in existing if str(t["end_date"]) >= before]
+                if len(kept) == len(existing):
+                    continue
+                dropped += len(existing) - len(kept)
+                if kept:
+                    save_yaml(path, {"tournaments": kept})
+                else:
+                    path.unlink()
+        return dropped
+
+def move_cold(store, cold, cutoff):
+    """Move all tournaments that ended before ISO date `cutoff` into the cold
+    archive; return how many were moved. Runs under the store's write lock,
+    so no worker writes the tournaments or the year files in between."""
+    def build(tournaments):
+        old = [t for t in tournaments if str(t["end_date"]) < cutoff]
+        # Cold files first: a crash in between leaves a duplicate, never a loss
+        if old:
+            cold.add(old)
+        return [{"op": "delete_tournament", "tid": t["id"]} for t in old]
+    moved = store.apply_with(build)
+    if moved:
+        store.compact()
+    return len(moved)
+
+_held = []  # the leader's lock file, open for the life of the process
+
+def _leader(lockfile):
+    """True if this process holds `lockfile` (kept until it exits)."""
+    f = try_lock(lockfile)
+    if f is None:
+        return False
+    _held.append(f)
+    return True
+
+def start_tiering(targets, cutoff_fn, interval_seconds, lockfile):
+    """Run move_cold() periodically in a daemon thread for every (store, cold)
+    pair targets() returns at that time. Of all processes started with the
+    same `lockfile`, only the one holding it does the work."""
+    def loop():
+        leader = False
+        while True:
+            time.sleep(interval_seconds)
+            leader = leader or _leader(lockfile)
+            if not leader:
+                continue
+            for store, cold in targets():
+                try:
+                    move_cold(store, cold, cutoff_fn())
+                except Exception:  # keep the thread alive, try again next round
+                    logging.getLogger(__name__).exception("moving tournaments to the cold archive failed")
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,106 @@
+"""
+Turnierverwaltung – Ansichtsmodelle
+Unveränderliche, vorberechnete Darstellung eines Turniers (Tage, formatierte
+Daten, sortierte Teilnehmer mit Statuszellen). Wird einmal pro Datenstand
+gebaut; Routen wählen nur noch aus und rendern.
+"""
+import datetime as dt
+from dataclasses import dataclass
+from jinja2.utils import htmlsafe_json_dumps
+from indexes import Attendance
+
+DISPLAY_FMT = "%d.%m.%y"
+
+@dataclass(frozen=True, slots=True)
+class DayView:
+    iso: str
+    fmt: str
+    attending: int
+    interested: int
+
+@dataclass(frozen=True, slots=True)
+class ParticipantView:
+    id: str
+    name: str
+    cells: tuple          # status name per day
+    statuses_json: str    # for prefilling the signup form
+
+@dataclass(frozen=True, slots=True)
+class TournamentView:
+    id: str
+    name: str
+    start_date: str       # ISO
+    end_date: str
+    start: dt.date
+    end: dt.date
+    start_fmt: str
+    end_fmt: str
+    location: str
+    link: str
+    description: str
+    dates: tuple          # DayView per day
+    participants: tuple   # ParticipantView, sorted by name
+    cold: bool
+    version: object       # fragment cache key part
+
+    def participant(self, pid):
+        return next((p for p in self.participants if p.id == pid), None)
+
+def _date(value):
+    return value if isinstance(value, dt.date) else dt.date.fromisoformat(value)
+
+def build_view(stored, version, attendance=None, cold=False):
+    """TournamentView of a stored tournament dict; `attendance` is its live
+    matrix if there is one."""
+    start, end = _date(stored["start_date"]), _date(stored["end_date"])
+    if attendance is None:
+        attendance = Attendance.of(stored)
+    days = tuple(start + dt.timedelta(days=i) for i in range((end - start).days + 1))
+    return TournamentView(
+        id=stored["id"],
+        name=stored["name"],
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        start=start,
+        end=end,
+        start_fmt=start.strftime(DISPLAY_FMT),
+        end_fmt=end.strftime(DISPLAY_FMT),
+        location=stored.get("location") or "",
+        link=stored.get("link") or "",
+        description=stored.get("description") or "",
+        dates=tuple(DayView(d.isoformat(), d.strftime(DISPLAY_FMT), a, i)
+                    for d, a, i in zip(days, attendance.attending, attendance.interested)),
+        participants=tuple(
+            ParticipantView(p["id"], p["name"], tuple(attendance.statuses(p["id"])),
+                            htmlsafe_json_dumps(p["statuses"]))
+            for p in sorted(stored["participants"], key=lambda p: p["name"].lower())),
+        cold=cold,
+        version=version,
+    )
+
+class ViewCache:
+    """TournamentViews of the hot data by id; a view is rebuilt only when its
+    tournament's version changes."""
+
+    def __init__(self):
+        self._views = {}
+
+    def get(self, store, tid):
+        view = self._views.get(tid)
+        if view is not None and view.version == store.versions.get(tid):
+            return view
+        # The attendance matrix is updated in place: build under the store's
+        # lock, or a concurrent signup could move rows while they are read
+        with store.reading():
+            version = store.versions.get(tid)
+            stored = store.by_id.get(tid)
+            if stored is None:
+                self._views.pop(tid, None)
+                return None
+            view = build_view(stored, version, store.indexes["attendance"].get(tid))
+        self._views[tid] = view
+        return view
+
+    def prune(self, live_ids):
+        for tid in self._views.keys() - live_ids:
+            del self._views[tid]